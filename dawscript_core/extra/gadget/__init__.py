@@ -1,4 +1,9 @@
 # SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
 # SPDX-License-Identifier: MIT
 
+from .control import *
+from .encoder import *
 from .footswitch import *
+from .hub import *
+from .router import *
+from .target import *
@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from mido import Message
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent
+
+from .router import MidiRouter
+from .target import Target
+
+
+class ContinuousControl:
+    """
+    Absolute controller like an expression pedal or fader. Once per tick the
+    latest value is optionally smoothed and then dropped unless it moved more
+    than deadband, or more than hysteresis when it reverses direction, which
+    filters the usual one step jitter. With pickup enabled a target is only
+    written after the control crosses its current host value.
+    """
+
+    PICKUP_RANGE = 2 / 127
+    SETTLED = 0.5 / 127
+
+    def __init__(self, deadband: float = 0.0, hysteresis: float = 1.5 / 127,
+                 smoothing: float = 0.0, pickup: bool = False, router: MidiRouter = None):
+        self._deadband = deadband
+        self._hysteresis = hysteresis
+        self._smoothing = smoothing  # [0,1), weight of the previous tick value
+        self._pickup = pickup
+        self._router = router if router is not None else MidiRouter()
+        self._mappings: List[Tuple[Callable, Message, bool]] = []
+        self._wakeup: Callable[["ContinuousControl"], None] = None
+        self._targets: List[Target] = []
+        self._picked_up: Dict[Target, Optional[float]] = {}
+        self._callback: Callable[[float], None] = None
+        self._input: Optional[float] = None
+        self._smoothed: Optional[float] = None
+        self._value: Optional[float] = None
+        self._previous: Optional[float] = None
+        self._direction = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    """
+   Targets
+   """
+
+    def add_target(self, target: Target) -> Target:
+        self._targets.append(target)
+        self._picked_up[target] = None
+        return target
+
+    def remove_target(self, target: Target):
+        self._targets.remove(target)
+        del self._picked_up[target]
+
+    """
+   Manual input
+   """
+
+    def set(self, value: float):
+        self._input = value
+        if self._wakeup:
+            self._wakeup(self)
+
+    """
+   MIDI input
+   """
+
+    def map_midi(self, msg: Message = None, omni=False, **kwargs):
+        if msg is None:
+            msg = Message(**kwargs)
+
+        def handler(event: MidiEvent):
+            self.set(event.data2 / 127)
+
+        self._router.add_message(handler, msg, omni)
+        self._mappings.append((handler, msg, omni))
+
+    def attach(self, router: MidiRouter, wakeup: Callable[["ContinuousControl"], None]):
+        # Moves the MIDI mappings to router, wakeup is called on every input
+        for handler, msg, omni in self._mappings:
+            self._router.remove(handler)
+            router.add_message(handler, msg, omni)
+        self._router = router
+        self._wakeup = wakeup
+
+    """
+   Callback interface
+   """
+
+    def set_callback(self, callback: Callable[[float], None]):
+        self._callback = callback
+
+    def fire_callbacks(self):
+        if self.poll():
+            for target in self._targets:
+                self._write(target)
+            if self._callback:
+                self._callback(self._value)
+
+    """
+   Polling interface
+   """
+
+    def poll(self) -> bool:
+        if self._input is None:
+            return False
+
+        if self._smoothed is None or not self._smoothing:
+            self._smoothed = self._input
+        else:
+            self._smoothed += (1 - self._smoothing) * (self._input - self._smoothed)
+            if abs(self._input - self._smoothed) < ContinuousControl.SETTLED:
+                self._smoothed = self._input
+
+        value = self._smoothed
+
+        if self._value is not None:
+            diff = value - self._value
+            direction = (diff > 0) - (diff < 0)
+            if direction != self._direction and self._direction != 0:
+                threshold = self._hysteresis
+            else:
+                threshold = self._deadband
+            if abs(diff) <= threshold:
+                return False
+            self._direction = direction
+
+        self._previous = self._value
+        self._value = value
+
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        # Smoothing keeps running until the value settles
+        if self._input is not None and self._smoothed != self._input:
+            return time.monotonic()
+        return None
+
+    def _write(self, target: Target):
+        if self._pickup:
+            host_value = target.get_value()
+            last = self._picked_up[target]
+
+            # Lost when the host value was changed elsewhere
+            if last is not None and abs(host_value - last) > ContinuousControl.PICKUP_RANGE:
+                last = None
+
+            if last is None and not self._crossed(host_value):
+                self._picked_up[target] = None
+                return
+
+            self._picked_up[target] = self._value
+
+        target.move_to(self._value)
+        target.flush()
+
+    def _crossed(self, host_value: float) -> bool:
+        if abs(self._value - host_value) <= ContinuousControl.PICKUP_RANGE:
+            return True
+        if self._previous is None:
+            return False
+        return (self._previous - host_value) * (self._value - host_value) <= 0
+
+    """
+   Convenience methods
+   """
+
+    def process(self, msgs: List[Union[bytes, TimestampedMidi, MidiEvent]]):
+        self._router.route(msgs)
+        self.fire_callbacks()
@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from enum import Enum
+from typing import Callable, List, Optional, Tuple, Union
+
+from mido import Message
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent
+
+from .router import MidiRouter
+from .target import Target
+
+
+class Encoding(Enum):
+    TWOS_COMPLEMENT = 0  # 1..63 up, 127..65 down
+    SIGN_MAGNITUDE = 1   # 1..63 up, 65..127 down
+    OFFSET_BINARY = 2    # 65..127 up, 63..0 down, 64 is zero
+
+
+def decode_relative(value: int, encoding: Encoding) -> int:
+    if encoding == Encoding.TWOS_COMPLEMENT:
+        return value - 128 if value & 0x40 else value
+    elif encoding == Encoding.SIGN_MAGNITUDE:
+        return -(value & 0x3F) if value & 0x40 else value
+    else:
+        return value - 64
+
+
+class Encoder:
+    # Detents closer than ACCEL_MAX_SEC are multiplied by up to 1 + acceleration,
+    # reached at ACCEL_MIN_SEC
+    ACCEL_MIN_SEC = 0.005
+    ACCEL_MAX_SEC = 0.1
+
+    def __init__(self, encoding: Encoding = Encoding.TWOS_COMPLEMENT, step: float = 0.01,
+                 acceleration: float = 0.0, router: MidiRouter = None):
+        self._encoding = encoding
+        self._step = step
+        self._acceleration = acceleration
+        self._router = router if router is not None else MidiRouter()
+        self._mappings: List[Tuple[Callable, Message, bool]] = []
+        self._wakeup: Callable[["Encoder"], None] = None
+        self._targets: List[Target] = []
+        self._callback: Callable[[float], None] = None
+        self._delta = 0.0
+        self._turn_t = 0
+        self._turn_sign = 0
+
+    """
+   Targets
+   """
+
+    def add_target(self, target: Target) -> Target:
+        self._targets.append(target)
+        return target
+
+    def remove_target(self, target: Target):
+        self._targets.remove(target)
+
+    """
+   Manual input
+   """
+
+    # t is a time.monotonic() value like TimestampedMidi.time, defaults to now
+
+    def turn(self, steps: int, t: float = None):
+        now = time.monotonic() if t is None else t
+        # A reversal starts over unaccelerated
+        sign = (steps > 0) - (steps < 0)
+        dt = now - self._turn_t if sign == self._turn_sign else Encoder.ACCEL_MAX_SEC
+        self._turn_t = now
+        self._turn_sign = sign
+
+        delta = steps * self._step
+
+        if self._acceleration and dt < Encoder.ACCEL_MAX_SEC:
+            speed = (Encoder.ACCEL_MAX_SEC - max(dt, Encoder.ACCEL_MIN_SEC)) \
+                / (Encoder.ACCEL_MAX_SEC - Encoder.ACCEL_MIN_SEC)
+            delta *= 1 + self._acceleration * speed
+
+        self._delta += delta
+
+        for target in self._targets:
+            target.move(delta)
+
+        if self._wakeup:
+            self._wakeup(self)
+
+    """
+   MIDI input
+   """
+
+    def map_midi(self, msg: Message = None, omni=False, **kwargs):
+        if msg is None:
+            msg = Message(**kwargs)
+
+        def handler(event: MidiEvent):
+            steps = decode_relative(event.data2, self._encoding)
+            if steps:
+                self.turn(steps, event.time or None)
+
+        self._router.add_message(handler, msg, omni)
+        self._mappings.append((handler, msg, omni))
+
+    def attach(self, router: MidiRouter, wakeup: Callable[["Encoder"], None]):
+        # Moves the MIDI mappings to router, wakeup is called on every input
+        for handler, msg, omni in self._mappings:
+            self._router.remove(handler)
+            router.add_message(handler, msg, omni)
+        self._router = router
+        self._wakeup = wakeup
+
+    """
+   Callback interface
+   """
+
+    # Called once per tick with the accumulated, accelerated delta
+
+    def set_callback(self, callback: Callable[[float], None]):
+        self._callback = callback
+
+    def fire_callbacks(self):
+        if self._delta == 0:
+            return
+
+        delta = self._delta
+        self._delta = 0.0
+
+        for target in self._targets:
+            target.flush()
+
+        if self._callback:
+            self._callback(delta)
+
+    def next_deadline(self) -> Optional[float]:
+        return None
+
+    """
+   Convenience methods
+   """
+
+    def process(self, msgs: List[Union[bytes, TimestampedMidi, MidiEvent]]):
+        self._router.route(msgs)
+        self.fire_callbacks()
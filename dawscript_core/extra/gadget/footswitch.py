@@ -3,10 +3,13 @@
 
 import time
 from enum import Enum
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from mido import Message
-from dawscript_core.util import is_note_on_or_note_off
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent
+
+from .router import MidiRouter
 
 
 class State(Enum):
@@ -20,9 +23,14 @@ class Footswitch:
     PRESS_TWICE_SEC = 0.3
     RELEASE_SLOW_SEC = 1
 
-    def __init__(self):
+    # With a shared router call router.route() once per tick and then
+    # fire_callbacks() or poll() instead of process(). See also GadgetHub.
+
+    def __init__(self, router: MidiRouter = None):
         self._state: State = None
-        self._midi_map: List[(Message, bool, bool)] = list()
+        self._router = router if router is not None else MidiRouter()
+        self._mappings: List[Tuple[Callable, Message, bool]] = []
+        self._wakeup: Callable[["Footswitch"], None] = None
         self._callbacks: Dict[State, Callable] = dict()
         self._release_flag = 0
         self._press_flag = False
@@ -53,14 +61,20 @@ class Footswitch:
    Manual input
    """
 
-    def press(self):
-        now = time.time()
+    # t is a time.monotonic() value like TimestampedMidi.time, defaults to now
+
+    def press(self, t: float = None):
+        now = time.monotonic() if t is None else t
         self._press_flag = True
         self._press_dt = now - self._press_t
         self._press_t = now
+        if self._wakeup:
+            self._wakeup(self)
 
     def release(self):
         self._release_flag = True
+        if self._wakeup:
+            self._wakeup(self)
 
     """
    MIDI input
@@ -69,31 +83,42 @@ class Footswitch:
     def map_midi_press(self, msg: Message = None, omni=False, **kwargs):
         if msg is None:
             msg = Message(**kwargs)
-        self._midi_map.append((msg, True, omni))
+        self._map_midi(msg, True, omni)
 
     def map_midi_release(self, msg: Message = None, omni=False, **kwargs):
         if msg is None:
             msg = Message(**kwargs)
-        self._midi_map.append((msg, False, omni))
-
-    def add_midi_message(self, msg: Message):
-        for map_msg, press, omni in self._midi_map:
-            if map_msg.channel != map_msg.channel and not omni:
-                continue
-            if (
-                msg.is_cc()
-                and map_msg.is_cc()
-                and msg.control == map_msg.control
-                and msg.value == map_msg.value
-            ) or (
-                is_note_on_or_note_off(msg)
-                and is_note_on_or_note_off(map_msg)
-                and msg.note == map_msg.note
-            ):
-                if press:
-                    self.press()
-                else:
-                    self.release()
+        self._map_midi(msg, False, omni)
+
+    def add_midi_message(self, msg: Union[MidiEvent, Message], t: float = None):
+        if isinstance(msg, Message):
+            msg = MidiEvent(bytes(msg.bytes()), t or 0)
+        elif t is not None:
+            msg = MidiEvent(msg.data, t)
+        self._router.dispatch(msg)
+
+    def _map_midi(self, msg: Message, press: bool, omni: bool):
+        # CCs also match the value, notes match note on and off
+        value = msg.value if msg.is_cc() else None
+
+        def handler(event: MidiEvent):
+            if value is not None and event.data2 != value:
+                return
+            if press:
+                self.press(event.time or None)
+            else:
+                self.release()
+
+        self._router.add_message(handler, msg, omni)
+        self._mappings.append((handler, msg, omni))
+
+    def attach(self, router: MidiRouter, wakeup: Callable[["Footswitch"], None]):
+        # Moves the MIDI mappings to router, wakeup is called on every input
+        for handler, msg, omni in self._mappings:
+            self._router.remove(handler)
+            router.add_message(handler, msg, omni)
+        self._router = router
+        self._wakeup = wakeup
 
     """
    Callback interface
@@ -135,7 +160,7 @@ class Footswitch:
         updated = False
 
         if self._press_t > 0 and self._release_flag:
-            dt = time.time() - self._press_t
+            dt = time.monotonic() - self._press_t
             if dt > Footswitch.RELEASE_SLOW_SEC:
                 self._state = State.RELEASED_SLOW
                 updated = True
@@ -151,13 +176,24 @@ class Footswitch:
 
         return updated
 
+    def next_deadline(self) -> Optional[float]:
+        # time.monotonic() value when poll() can next update the state
+        if self._press_flag:
+            return time.monotonic()
+        if self._press_t > 0 and self._release_flag:
+            return self._press_t + Footswitch.PRESS_TWICE_SEC
+        if self._press_dt > 0 and self._press_dt < Footswitch.PRESS_TWICE_SEC:
+            return time.monotonic()
+        return None
+
     """
    Convenience methods
    """
 
-    def process(self, msgs: List[Union[bytes, Message]]):
+    def process(self, msgs: List[Union[bytes, TimestampedMidi, MidiEvent, Message]]):
         for msg in msgs:
-            if not isinstance(msg, Message):
-                msg = Message.from_bytes(msg)
-            self.add_midi_message(msg)
+            if isinstance(msg, Message):
+                self.add_midi_message(msg)
+            else:
+                self._router.route((msg,))
         self.fire_callbacks()
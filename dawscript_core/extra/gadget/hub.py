@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Set, Union
+
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent
+
+from .router import MidiRouter
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel on the time.monotonic() clock. Keys are placed in the
+    slot of their deadline, advance() only visits the slots elapsed since the
+    previous call. Deadlines further than one revolution stay in their slot
+    until due.
+    """
+
+    def __init__(self, resolution: float = 0.01, size: int = 256):
+        self._resolution = resolution
+        self._slots: List[Dict[Hashable, float]] = [dict() for _ in range(size)]
+        self._where: Dict[Hashable, int] = {}
+        self._cursor = int(time.monotonic() / resolution)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def schedule(self, key: Hashable, deadline: float):
+        self.cancel(key)
+        tick = max(int(deadline / self._resolution), self._cursor)
+        index = tick % len(self._slots)
+        self._slots[index][key] = deadline
+        self._where[key] = index
+
+    def cancel(self, key: Hashable):
+        index = self._where.pop(key, None)
+        if index is not None:
+            del self._slots[index][key]
+
+    def advance(self, now: float) -> List[Hashable]:
+        target = int(now / self._resolution)
+
+        if not self._where:
+            self._cursor = target
+            return []
+
+        expired = []
+        size = len(self._slots)
+
+        for tick in range(self._cursor, min(target, self._cursor + size - 1) + 1):
+            slot = self._slots[tick % size]
+            for key, deadline in list(slot.items()):
+                if deadline <= now:
+                    expired.append(key)
+                    del slot[key]
+                    del self._where[key]
+
+        # Current slot is visited again, it can hold deadlines later this tick
+        self._cursor = target
+
+        return expired
+
+
+class GadgetHub:
+    """
+    Owns a set of gadgets, decodes incoming MIDI once through a shared router
+    and only runs gadgets that received input or reached a gesture deadline.
+
+    Gadgets implement attach(router, wakeup) to register their MIDI routes
+    and get a function to call when their state changes, fire_callbacks(),
+    and next_deadline() returning the time.monotonic() value when they need
+    to run again, or None when idle.
+    """
+
+    def __init__(self, gadgets: Iterable[Any] = ()):
+        self.router = MidiRouter()
+        self._gadgets: List[Any] = []
+        self._ready: Set[Any] = set()
+        self._wheel = TimerWheel()
+
+        for gadget in gadgets:
+            self.add(gadget)
+
+    def add(self, gadget: Any) -> Any:
+        gadget.attach(self.router, self._wakeup)
+        self._gadgets.append(gadget)
+        return gadget
+
+    def remove(self, gadget: Any):
+        gadget.attach(MidiRouter(), None)
+        self._gadgets.remove(gadget)
+        self._ready.discard(gadget)
+        self._wheel.cancel(gadget)
+
+    def process(self, midi: List[Union[bytes, TimestampedMidi, MidiEvent]]):
+        self.router.route(midi)
+
+        now = time.monotonic()
+        self._ready.update(self._wheel.advance(now))
+
+        while self._ready:
+            ready, self._ready = self._ready, set()
+            for gadget in ready:
+                gadget.fire_callbacks()
+                deadline = gadget.next_deadline()
+                if deadline is None:
+                    self._wheel.cancel(gadget)
+                else:
+                    self._wheel.schedule(gadget, deadline)
+
+    def _wakeup(self, gadget: Any):
+        self._ready.add(gadget)
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from mido import Message
+from dawscript_core.host.impl.util import MIDI_STATUS
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent, make_midi_event
+
+RouteKey = Tuple[int, Optional[int], Optional[int]]
+Handler = Callable[[MidiEvent], None]
+
+
+class MidiRouter:
+    """
+    Dispatches channel messages to handlers registered by type, channel and
+    first data byte (note, control or program). Routes are kept in a dict
+    keyed by (status, channel, data1) where channel and data1 can be None to
+    match any, so each message costs at most four lookups no matter how many
+    routes exist. Messages are decoded once and shared by all handlers.
+    """
+
+    def __init__(self):
+        self._routes: Dict[RouteKey, List[Handler]] = {}
+        self._has_omni = False
+
+    def add(self, handler: Handler, type: str, channel: int = None, data1: int = None):
+        key = (MIDI_STATUS[type], channel, data1)
+        self._routes.setdefault(key, []).append(handler)
+        self._has_omni |= channel is None or data1 is None
+
+    def add_message(self, handler: Handler, msg: Union[Message, MidiEvent], omni: bool = False):
+        """
+        Routes messages like msg, notes match both note on and off.
+        """
+        if msg.type == "control_change":
+            data1 = msg.control
+        elif msg.type in ("note_on", "note_off", "polytouch"):
+            data1 = msg.note
+        elif msg.type == "program_change":
+            data1 = msg.program
+        else:
+            data1 = None
+
+        channel = None if omni else msg.channel
+
+        if msg.type in ("note_on", "note_off"):
+            self.add(handler, "note_on", channel, data1)
+            self.add(handler, "note_off", channel, data1)
+        else:
+            self.add(handler, msg.type, channel, data1)
+
+    def remove(self, handler: Handler):
+        for key in list(self._routes):
+            handlers = [h for h in self._routes[key] if h != handler]
+            if handlers:
+                self._routes[key] = handlers
+            else:
+                del self._routes[key]
+
+        self._has_omni = any(ch is None or d1 is None for _, ch, d1 in self._routes)
+
+    def route(self, midi: List[Union[bytes, TimestampedMidi, MidiEvent]]):
+        for msg in midi:
+            self.dispatch(msg if type(msg) is MidiEvent else make_midi_event(msg))
+
+    def dispatch(self, event: MidiEvent) -> bool:
+        if event.channel is None:
+            return False  # system messages are not routed
+
+        routes = self._routes
+        kind = event.status & 0xF0
+        found = False
+
+        handlers = routes.get((kind, event.channel, event.data1))
+        if handlers is not None:
+            found = True
+            for handler in handlers:
+                handler(event)
+
+        if not self._has_omni:
+            return found
+
+        for key in ((kind, None, event.data1), (kind, event.channel, None), (kind, None, None)):
+            handlers = routes.get(key)
+            if handlers is not None:
+                found = True
+                for handler in handlers:
+                    handler(event)
+
+        return found
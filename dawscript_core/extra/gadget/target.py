@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from dawscript_core import host
+from dawscript_core.host.types import ParameterHandle, TrackHandle
+
+
+class Target(ABC):
+    """
+    Host value seen by gadgets on a normalized [0,1] scale. Gadgets call
+    move() or move_to() for every input and flush() once per tick, so the
+    host is written at most once per tick no matter how many gadgets or
+    messages moved it.
+    """
+
+    def __init__(self):
+        self._value: Optional[float] = None
+        self._delta = 0.0
+
+    @abstractmethod
+    def get_value(self) -> float:
+        pass
+
+    @abstractmethod
+    def set_value(self, value: float):
+        pass
+
+    def move(self, delta: float):
+        self._delta += delta
+
+    def move_to(self, value: float):
+        self._value = value
+        self._delta = 0.0
+
+    def flush(self) -> Optional[float]:
+        if self._value is None and self._delta == 0:
+            return None
+        base = self.get_value() if self._value is None else self._value
+        value = min(max(base + self._delta, 0.0), 1.0)
+        self._value = None
+        self._delta = 0.0
+        self.set_value(value)
+        return value
+
+
+class VolumeTarget(Target):
+    def __init__(self, track: TrackHandle):
+        super().__init__()
+        self._track = track
+
+    def get_value(self) -> float:
+        return host.get_track_volume(self._track)
+
+    def set_value(self, value: float):
+        host.set_track_volume(self._track, value)
+
+
+class PanTarget(Target):
+    def __init__(self, track: TrackHandle):
+        super().__init__()
+        self._track = track
+
+    def get_value(self) -> float:
+        return (host.get_track_pan(self._track) + 1) / 2
+
+    def set_value(self, value: float):
+        host.set_track_pan(self._track, value * 2 - 1)
+
+
+class ParameterTarget(Target):
+    def __init__(self, param: ParameterHandle):
+        super().__init__()
+        self._param = param
+
+    def get_value(self) -> float:
+        return host.get_parameter_normalized_value(self._param)
+
+    def set_value(self, value: float):
+        host.set_parameter_normalized_value(self._param, value)
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import struct
+import time
+from collections import namedtuple
+from typing import BinaryIO, Callable, Iterator, List, Tuple, Union
+
+from dawscript_core.host.types import TimestampedMidi
+
+# Records the MIDI batches delivered to host_callback() on any host and
+# replays them through the CLI backend, see DAWSCRIPT_CLI_REPLAY in cli.py.
+#
+#   recorder = Recorder("set.dsmr")
+#
+#   def host_callback(midi):
+#       recorder.record(midi)
+#       ...
+#
+# File format, big-endian:
+#
+#   header   4s B B     magic, version, flags (bit 0: message times)
+#   tick     I H        microseconds since previous tick, message count
+#   message  B ...      length, bytes
+#            [i]        microseconds relative to tick, if flags bit 0
+
+MAGIC = b"DSMR"
+VERSION = 1
+FLAG_MESSAGE_TIMES = 0x01
+
+_HEADER = struct.Struct(">4sBB")
+_TICK = struct.Struct(">IH")
+_LENGTH = struct.Struct(">B")
+_MESSAGE_TIME = struct.Struct(">i")
+
+ReplayStats = namedtuple("ReplayStats", ["ticks", "messages", "mean_us", "p50_us", "p99_us", "max_us"])
+
+
+class Recorder:
+    """
+    Appends one record per host_callback() call, including calls without MIDI
+    so timer driven gadgets replay the same number of ticks. Message times are
+    kept when the host delivers TimestampedMidi.
+    """
+
+    def __init__(self, path: str, message_times: bool = True):
+        self._file: BinaryIO = open(path, "wb")
+        self._flags = FLAG_MESSAGE_TIMES if message_times else 0
+        self._last_tick = time.monotonic()
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self._flags))
+
+    def record(self, midi: List[Union[bytes, TimestampedMidi]]):
+        now = time.monotonic()
+        delta_us = min(int((now - self._last_tick) * 1e6), 0xFFFFFFFF)
+        self._last_tick = now
+
+        chunks = [_TICK.pack(delta_us, len(midi))]
+
+        for msg in midi:
+            if type(msg) is TimestampedMidi:
+                data, msg_time = msg.data, msg.time
+            else:
+                data, msg_time = msg, now
+            chunks.append(_LENGTH.pack(len(data)))
+            chunks.append(data)
+            if self._flags & FLAG_MESSAGE_TIMES:
+                chunks.append(_MESSAGE_TIME.pack(int((msg_time - now) * 1e6)))
+
+        self._file.write(b"".join(chunks))
+
+    def wrap(self, host_callback: Callable) -> Callable:
+        def recording_host_callback(midi):
+            self.record(midi)
+            host_callback(midi)
+        return recording_host_callback
+
+    def close(self):
+        self._file.close()
+
+
+class Replayer:
+    """
+    Reads a recorded session. ticks() yields the time of each tick in seconds
+    since the first one and its MIDI batch, with TimestampedMidi times on the
+    same scale when the file has message times.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._data = f.read()
+
+        if len(self._data) < _HEADER.size:
+            raise ValueError(f"{path} is not a session file")
+
+        magic, version, self._flags = _HEADER.unpack_from(self._data)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} session file")
+
+    def ticks(self, timestamps: bool = False) -> Iterator[Tuple[float, List[Union[bytes, TimestampedMidi]]]]:
+        # Raises ValueError if the file ends in the middle of a tick
+        data = self._data
+        offset = _HEADER.size
+        message_times = self._flags & FLAG_MESSAGE_TIMES
+        tick_us = 0
+        first = True
+
+        while offset < len(data):
+            if len(data) - offset < _TICK.size:
+                raise ValueError("session file is truncated")
+            delta_us, count = _TICK.unpack_from(data, offset)
+            offset += _TICK.size
+            tick_us = 0 if first else tick_us + delta_us
+            first = False
+            midi = []
+
+            for _ in range(count):
+                if offset >= len(data):
+                    raise ValueError("session file is truncated")
+                length = data[offset]
+                if offset + _LENGTH.size + length + (_MESSAGE_TIME.size if message_times else 0) > len(data):
+                    raise ValueError("session file is truncated")
+                offset += _LENGTH.size
+                msg = data[offset:offset + length]
+                offset += length
+                msg_us = tick_us
+                if message_times:
+                    msg_us += _MESSAGE_TIME.unpack_from(data, offset)[0]
+                    offset += _MESSAGE_TIME.size
+                midi.append(TimestampedMidi(msg, msg_us / 1e6, None) if timestamps else msg)
+
+            yield (tick_us / 1e6, midi)
+
+
+def replay_stats(cpu_us: List[float], messages: int) -> ReplayStats:
+    if not cpu_us:
+        return ReplayStats(0, messages, 0.0, 0.0, 0.0, 0.0)
+
+    ordered = sorted(cpu_us)
+    n = len(ordered)
+
+    return ReplayStats(
+        n,
+        messages,
+        sum(ordered) / n,
+        ordered[n // 2],
+        ordered[min(n - 1, int(n * 0.99))],
+        ordered[-1]
+    )
@@ -3,4 +3,5 @@
 
 from .common import *
 from .impl import *
+from .scheduler import Priority, defer
 from .types import *
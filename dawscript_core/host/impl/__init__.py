@@ -54,9 +54,15 @@ def get_parameter_name(param: ParameterHandle) -> str
 def get_parameter_range(param: ParameterHandle) -> Tuple[float, float]
 def get_parameter_value(param: ParameterHandle) -> float
 def set_parameter_value(param: ParameterHandle, value: float)
+def get_parameter_normalized_value(param: ParameterHandle) -> float
+def set_parameter_normalized_value(param: ParameterHandle, value: float)
 def add_parameter_value_listener(param: ParameterHandle, listener: Callable[[float],None])
 def remove_parameter_value_listener(param: ParameterHandle, listener: Callable[[float],None])
 def get_parameter_display_value(param: ParameterHandle) -> str
 def add_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None])
 def remove_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None])
+def rebuild_midi_cc_mappings()
+
+Deferred work posted with dawscript_core.host.defer() and listener callbacks
+run from dawscript_core.host.scheduler on every host tick.
 """
@@ -1,18 +1,32 @@
 # SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
 # SPDX-License-Identifier: MIT
 
+import queue
+import struct
 import sys
+import threading
 import time
+from collections import namedtuple
+from contextlib import contextmanager
 from types import ModuleType
-from typing import Any, Callable, List, Tuple
-
-from .util import map_interp
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from .util import (
+    apply_midi_cc_map,
+    compile_midi_filter,
+    make_midi_cc_map,
+    map_interp,
+    mask_indices,
+    unpack_project_layout
+)
+from ..scheduler import Priority, scheduler
 from ..types import (
     ALL_MIDI_INPUTS,
     AnyHandle,
     IncompatibleEnvironmentError,
     ParameterHandle,
     PluginHandle,
+    TimestampedMidi,
     TrackHandle,
     TrackType
 )
@@ -23,9 +37,21 @@ except ModuleNotFoundError:
     # fails to import on Live
     raise IncompatibleEnvironmentError
 
-if len(sys.argv) < 2:
+# Started by the extension with the gateway port as only argument
+if len(sys.argv) < 2 or not sys.argv[1].isdigit():
     raise IncompatibleEnvironmentError
 
+
+def _preload_modules():
+    # Imported later by controllers, loads while the gateway connects
+    try:
+        import mido # type: ignore
+    except ImportError:
+        pass
+
+
+threading.Thread(target=_preload_modules, daemon=True).start()
+
 try:
     port = int(sys.argv[1])
     gateway = JavaGateway(
@@ -35,9 +61,11 @@ try:
         ),
         callback_server_parameters=CallbackServerParameters(port=port + 1)
     )
-    gateway.jvm.java.lang.System.getProperty("java.version")
-    bw_ext_class = gateway.jvm.dawscript.DawscriptExtension;
     bw_ext = gateway.entry_point
+    # Doubles as connection test, lets Java tell a slow controller import
+    # apart from a Python process that never started
+    bw_ext.notifyPythonReady()
+    bw_ext_class = gateway.jvm.dawscript.DawscriptExtension
 except Py4JNetworkError as e:
     raise IncompatibleEnvironmentError
 
@@ -46,16 +74,38 @@ HOST_VOL_DB = [N_INF,   -36,   -24,   -18,   -12,    -6,     0,     6]
 HOST_VOL    = [0.000, 0.200, 0.316, 0.398, 0.500, 0.630, 0.793, 1.000]
 CLIENT_VOL  = [0.000, 0.226, 0.396, 0.491, 0.623, 0.755, 0.887, 1.000]
 
+TrackState = namedtuple("TrackState", ["index", "id", "name", "type", "mute", "volume", "pan", "plugins"])
+PluginState = namedtuple("PluginState", ["name", "enabled"])
+
+_controller = None
+_midi_cc_map: Dict[Tuple[int, int], List[ParameterHandle]] = {}
+_midi_timestamps = False
+_mirror: Dict[Tuple[int, int], Any] = {}
+_object_ids: Dict[str, int] = {}
+_subscribed: Set[str] = set()
+_listeners: Dict[Tuple[int, int], List[Tuple[Callable, Callable]]] = {}
+_in_host_callback = False
+_dispatch_queue: "queue.SimpleQueue[Tuple[int, Any]]" = queue.SimpleQueue()
+_slots: Dict[Tuple[int, ...], AnyHandle] = {}
+_slot_keys: Dict[str, Tuple[int, ...]] = {}
+_layout: List[List[int]] = None
+_track_window = 0
+_plugin_windows: Dict[int, int] = {}
+_parameter_windows: Dict[Tuple[int, int], int] = {}
+_layout_scoped = False
+
 
 def name() -> str:
     return "bitwig"
 
 
 def main(controller: ModuleType, context: Any):
+    global _controller
+    _controller = controller
+    scheduler.set_wakeup(_request_host_callback)
     bw_ext.setController(Controller(controller))
     try:
-        while True:
-            time.sleep(1)
+        _run_dispatcher()
     except KeyboardInterrupt:
         gateway.shutdown()
 
@@ -70,19 +120,15 @@ def display(message: str):
 
 
 def get_stable_object_id(handle: AnyHandle) -> str:
-    return f"{bw_ext_class.getStableObjectId(handle) & 0xFFFFFFFF:08x}"
+    return f"{_object_id(handle) & 0xFFFFFFFF:08x}"
 
 
 def get_tracks() -> List[TrackHandle]:
-    tracks = []
-    bank = bw_ext.getTrackBank()
-    for i in range(0, bank.itemCount().get()):
-        tracks.append(bank.getItemAt(i))
-    return tracks
+    return [_slot((i,), bw_ext.getTrackSlot) for i in range(len(_get_layout()))]
 
 
 def get_track_type(track: TrackHandle) -> TrackType:
-    track_type = track.trackType().get()
+    track_type = _mirrored(track, _PROP_TYPE, lambda: track.trackType().get())
     if track_type == 'Audio':
         return TrackType.AUDIO
     elif track_type == 'Instrument':
@@ -91,97 +137,100 @@ def get_track_type(track: TrackHandle) -> TrackType:
 
 
 def get_track_name(track: TrackHandle) -> str:
-    return track.name().get()
+    return _mirrored(track, _PROP_NAME, lambda: track.name().get())
 
 
 def is_track_mute(track: TrackHandle) -> bool:
-    return track.mute().get()
+    return _mirrored(track, _PROP_MUTE, lambda: track.mute().get())
 
 
 def set_track_mute(track: TrackHandle, mute: bool):
     track.mute().set(mute)
+    _write_mirror(track, _PROP_MUTE, bool(mute))
 
 
 def add_track_mute_listener(track: TrackHandle, listener: Callable[[bool],None]):
-    _add_listener(track, "mute", listener, is_track_mute)
+    _add_listener(track, _PROP_MUTE, listener, bool)
 
 
 def remove_track_mute_listener(track: TrackHandle, listener: Callable[[bool],None]):
-    _remove_listener(track, "mute", listener)
+    _remove_listener(track, _PROP_MUTE, listener)
 
 
 def get_track_volume(track: TrackHandle) -> float:
-    return map_interp(track.volume().get(), HOST_VOL, CLIENT_VOL)
+    return _client_volume(_mirrored(track, _PROP_VOLUME, lambda: track.volume().get()))
 
 
 def set_track_volume(track: TrackHandle, volume: float):
-    track.volume().setImmediately(map_interp(volume, CLIENT_VOL, HOST_VOL))
+    host_volume = map_interp(volume, CLIENT_VOL, HOST_VOL)
+    track.volume().setImmediately(host_volume)
+    _write_mirror(track, _PROP_VOLUME, host_volume)
 
 
 def add_track_volume_listener(track: TrackHandle, listener: Callable[[float],None]):
-    _add_listener(track, "volume", listener, get_track_volume)
+    _add_listener(track, _PROP_VOLUME, listener, _client_volume)
 
 
 def remove_track_volume_listener(track: TrackHandle, listener: Callable[[float],None]):
-    _remove_listener(track, "volume", listener)
+    _remove_listener(track, _PROP_VOLUME, listener)
 
 
 def get_track_pan(track: TrackHandle) -> float:
-    return track.pan().get()
+    return _mirrored(track, _PROP_PAN, lambda: track.pan().get())
 
 
 def set_track_pan(track: TrackHandle, pan: float):
     track.pan().setImmediately(float(pan))
+    _write_mirror(track, _PROP_PAN, float(pan))
 
 
 def add_track_pan_listener(track: TrackHandle, listener: Callable[[float],None]):
-    _add_listener(track, "pan", listener, get_track_pan)
+    _add_listener(track, _PROP_PAN, listener, float)
 
 
 def remove_track_pan_listener(track: TrackHandle, listener: Callable[[float],None]):
-    _remove_listener(track, "pan", listener)
+    _remove_listener(track, _PROP_PAN, listener)
 
 
 def get_track_plugins(track: TrackHandle) -> List[PluginHandle]:
-    plugins = []
-    bank = bw_ext.getTrackDeviceBank(track)
-    for i in range(0, bank.itemCount().get()):
-        plugins.append(bank.getItemAt(i))
-    return plugins
+    t, = _slot_key(track)
+    layout = _get_layout()
+    if t >= len(layout):
+        return []
+    return [_slot((t, d), bw_ext.getDeviceSlot) for d in range(len(layout[t]))]
 
 
 def get_plugin_name(plugin: PluginHandle) -> str:
-    return plugin.name().get()
+    return _mirrored(plugin, _PROP_NAME, lambda: plugin.name().get())
 
 
 def is_plugin_enabled(plugin: PluginHandle) -> bool:
-    return plugin.isEnabled().get()
+    return _mirrored(plugin, _PROP_ENABLED, lambda: plugin.isEnabled().get())
 
 
 def set_plugin_enabled(plugin: PluginHandle, enabled: bool):
     plugin.isEnabled().set(enabled)
+    _write_mirror(plugin, _PROP_ENABLED, bool(enabled))
 
 
 def add_plugin_enabled_listener(plugin: PluginHandle, listener: Callable[[bool],None]):
-    _add_listener(plugin, "enabled", listener, is_plugin_enabled)
+    _add_listener(plugin, _PROP_ENABLED, listener, bool)
 
 
 def remove_plugin_enabled_listener(plugin: PluginHandle, listener: Callable[[bool],None]):
-    _remove_listener(plugin, "enabled", listener)
+    _remove_listener(plugin, _PROP_ENABLED, listener)
 
 
 def get_plugin_parameters(plugin: PluginHandle) -> List[ParameterHandle]:
-    parameters = []
-    bank = bw_ext.getPluginParameterBank(plugin)
-    for i in range(0, bank.getParameterCount()):
-        param = bank.getParameter(i)
-        if param.name().get():
-            parameters.append(param)
-    return parameters
+    t, d = _slot_key(plugin)
+    layout = _get_layout()
+    if t >= len(layout) or d >= len(layout[t]):
+        return []
+    return [_slot((t, d, k), bw_ext.getParameterSlot) for k in mask_indices(layout[t][d])]
 
 
 def get_parameter_name(param: ParameterHandle) -> str:
-    return param.name().get()
+    return _mirrored(param, _PROP_NAME, lambda: param.name().get())
 
 
 def get_parameter_range(param: ParameterHandle) -> Tuple[float, float]:
@@ -189,92 +238,507 @@ def get_parameter_range(param: ParameterHandle) -> Tuple[float, float]:
 
 
 def get_parameter_value(param: ParameterHandle) -> float:
-    return param.value().get()
+    return _mirrored(param, _PROP_VALUE, lambda: param.value().get())
 
 
 def set_parameter_value(param: ParameterHandle, value: float):
     param.value().setImmediately(float(value))
+    _write_mirror(param, _PROP_VALUE, float(value))
+
+
+def get_parameter_normalized_value(param: ParameterHandle) -> float:
+    return get_parameter_value(param)
+
+
+def set_parameter_normalized_value(param: ParameterHandle, value: float):
+    set_parameter_value(param, value)
 
 
 def add_parameter_value_listener(param: ParameterHandle, listener: Callable[[float],None]):
-    _add_listener(param, "value", listener, get_parameter_value)
+    _add_listener(param, _PROP_VALUE, listener, float)
 
 
 def remove_parameter_value_listener(param: ParameterHandle, listener: Callable[[float],None]):
-    _remove_listener(param, "value", listener)
+    _remove_listener(param, _PROP_VALUE, listener)
 
 
 def get_parameter_display_value(param: ParameterHandle) -> str:
-    return param.displayedValue().get()
+    return _mirrored(param, _PROP_DISPLAY_VALUE, lambda: param.displayedValue().get())
 
 
 def add_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None]):
-    _add_listener(param, "dpy_value", listener, get_parameter_display_value)
+    _add_listener(param, _PROP_DISPLAY_VALUE, listener, str)
 
 
 def remove_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None]):
-    _remove_listener(param, "dpy_value", listener)
+    _remove_listener(param, _PROP_DISPLAY_VALUE, listener)
+
+
+def get_track_window() -> Tuple[int, int]:
+    """
+    Returns the position of the first track returned by get_tracks() and the
+    number of tracks in the project.
+    """
+    return (_track_window, bw_ext.getTrackCount())
+
+
+def set_track_window(position: int):
+    """
+    Scrolls the tracks returned by get_tracks() to reach tracks beyond the
+    bank size. Track handles and their listeners then refer to other tracks.
+    """
+    global _layout, _track_window
+    # Kept here, Bitwig applies the scroll position asynchronously
+    _track_window = max(0, int(position))
+    bw_ext.setTrackWindowPosition(_track_window)
+    _layout = None
+
+
+def get_plugin_window(track: TrackHandle) -> Tuple[int, int]:
+    """
+    Returns the position of the first plugin returned by get_track_plugins()
+    and the number of plugins on the track.
+    """
+    t, = _slot_key(track)
+    return (_plugin_windows.get(t, 0), bw_ext.getDeviceCount(t))
+
+
+def set_plugin_window(track: TrackHandle, position: int):
+    """
+    Scrolls the plugins returned by get_track_plugins() for the track slot.
+    """
+    global _layout
+    t, = _slot_key(track)
+    _plugin_windows[t] = max(0, int(position))
+    bw_ext.setDeviceWindowPosition(t, _plugin_windows[t])
+    _layout = None
+
+
+def get_parameter_window(plugin: PluginHandle) -> Tuple[int, int]:
+    """
+    Returns the remote controls page shown by get_plugin_parameters() and the
+    number of pages.
+    """
+    t, d = _slot_key(plugin)
+    return (_parameter_windows.get((t, d), 0), bw_ext.getParameterPageCount(t, d))
+
+
+def set_parameter_window(plugin: PluginHandle, page: int):
+    """
+    Selects the remote controls page shown by get_plugin_parameters().
+    """
+    global _layout
+    t, d = _slot_key(plugin)
+    _parameter_windows[(t, d)] = max(0, int(page))
+    bw_ext.setParameterPage(t, d, _parameter_windows[(t, d)])
+    _layout = None
+
+
+def get_mixer_snapshot() -> List[TrackState]:
+    """
+    Reads the visible mixer state in a single bridge crossing. Track index
+    is the position in get_tracks(), volume and pan use the same scale as
+    get_track_volume() and get_track_pan(). Plugin enabled is None until the
+    plugin is subscribed, eg. by is_plugin_enabled().
+    """
+    reader = _PackedReader(bw_ext.getMixerSnapshot())
+    tracks = []
+
+    for _ in range(reader.read_int()):
+        index, obj_id = reader.read(_TRACK_HEADER)
+        name = reader.read_string()
+        track_type, mute, volume, pan = reader.read(_TRACK_STATE)
+        plugins = [PluginState(reader.read_string(), _ENABLED_STATES[reader.read(_BYTE)[0]])
+                   for _ in range(reader.read_int())]
+        tracks.append(TrackState(
+            index,
+            f"{obj_id & 0xFFFFFFFF:08x}",
+            name,
+            _TRACK_TYPES[track_type],
+            mute,
+            map_interp(volume, HOST_VOL, CLIENT_VOL),
+            pan,
+            plugins
+        ))
+
+    return tracks
+
+
+def rebuild_midi_cc_mappings():
+    _midi_cc_map.clear()
+
+    try:
+        _midi_cc_map.update(make_midi_cc_map(_controller.get_midi_cc_mappings()))
+    except AttributeError:
+        pass
+
+
+def _object_id(handle: AnyHandle) -> int:
+    # Keyed by py4j proxy, a new proxy for the same object costs one extra call
+    try:
+        return _object_ids[handle._target_id]
+    except KeyError:
+        oid = bw_ext_class.getStableObjectId(handle)
+        _object_ids[handle._target_id] = oid
+        return oid
+
+
+def _subscribe(handle: AnyHandle) -> int:
+    # Java pushes changes for the object from now on. Ids can be cached by
+    # get_stable_object_id() without a subscription, so both are kept apart.
+    if handle._target_id in _subscribed:
+        return _object_id(handle)
+
+    oid = bw_ext.subscribe(handle)
+    _object_ids[handle._target_id] = oid
+    _subscribed.add(handle._target_id)
+
+    return oid
+
+
+def _mirrored(handle: AnyHandle, prop: int, read: Callable[[], Any]) -> Any:
+    # Serves values pushed by Java, the bridge is only crossed on first read.
+    # Properties Java subscribes lazily are not valid until Bitwig delivers
+    # them, so they are read through the bridge but only cached when pushed.
+    key = (_subscribe(handle), prop)
+
+    try:
+        return _mirror[key]
+    except KeyError:
+        value = read()
+        if prop not in _LAZY_PROPS:
+            _mirror[key] = value
+        return value
+
+
+def _write_mirror(handle: AnyHandle, prop: int, value: Any):
+    # Optimistic, Java pushes the value Bitwig settles on
+    key = (_subscribe(handle), prop)
+
+    if key in _mirror:
+        _mirror[key] = value
+
+
+def _add_listener(target: Any, prop: int, listener: Callable, convert: Callable):
+    # Java delivers raw values, convert() maps them like the matching getter
+    key = (_subscribe(target), prop)
+    _listeners.setdefault(key, []).append((listener, convert))
+
+
+def _remove_listener(target: Any, prop: int, listener: Callable):
+    key = (_subscribe(target), prop)
+    listeners = _listeners.get(key, [])
+    listeners[:] = [(l, c) for l, c in listeners if l != listener]
+
+    if not listeners:
+        _listeners.pop(key, None)
+
+
+def _update_mirror(changes: bytes):
+    reader = _PackedReader(changes)
+
+    while not reader.at_end():
+        oid, prop, tag = reader.read(_CHANGE_HEADER)
+
+        if tag == _VALUE_BOOLEAN:
+            value = reader.read_bool()
+        elif tag == _VALUE_DOUBLE:
+            value = reader.read(_DOUBLE)[0]
+        else:
+            value = reader.read_string()
+
+        key = (oid, prop)
+        _mirror[key] = value
+
+        for listener, convert in _listeners.get(key, ()):
+            scheduler.post(lambda l=listener, v=convert(value): l(v), Priority.HIGH)
+
+
+def _slot(key: Tuple[int, ...], fetch: Callable) -> AnyHandle:
+    # Bank slots never change identity, one bridge crossing per slot ever
+    try:
+        return _slots[key]
+    except KeyError:
+        handle = fetch(*key)
+        _slots[key] = handle
+        _slot_keys[handle._target_id] = key
+        return handle
+
+
+def _slot_key(handle: AnyHandle) -> Tuple[int, ...]:
+    # Handles that did not come from _slot() are looked up in the Java banks.
+    # Raises ValueError for objects outside them, eg. a cursor track.
+    try:
+        return _slot_keys[handle._target_id]
+    except KeyError:
+        pass
+
+    key = bw_ext.getSlotKey(handle)
+
+    if key is None:
+        raise ValueError(f"{handle} is not a track or device in the dawscript banks")
+
+    key = tuple(key)
+    _slot_keys[handle._target_id] = key
+
+    return key
 
 
-def _add_listener(target: Any, prop: str, listener: Callable, getter: Callable):
-    def bound_getter():
-        return getter(target)
+def _get_layout() -> List[List[int]]:
+    # Per track a list of device parameter masks, see getProjectLayout().
+    # Kept for the duration of a Java callback so walking the project costs a
+    # single bridge crossing, re-read on every call outside callbacks.
+    global _layout
 
-    runnable = PythonRunnable(lambda: listener(bound_getter()))
-    bw_ext.addListener(target, prop, id(listener), runnable)
+    if _layout is not None:
+        return _layout
 
+    layout = unpack_project_layout(bw_ext.getProjectLayout())
 
-def _remove_listener(target: Any, prop: str, listener: Callable):
-    bw_ext.removeListener(target, prop, id(listener))
+    if _layout_scoped:
+        _layout = layout
+
+    return layout
+
+
+@contextmanager
+def _callback_scope():
+    global _layout, _layout_scoped
+    _layout = None
+    _layout_scoped = True
+    try:
+        yield
+    finally:
+        _layout = None
+        _layout_scoped = False
+
+
+def _request_host_callback():
+    # Work deferred during host_callback() is picked up when it returns
+    if not _in_host_callback:
+        _dispatch_queue.put((_TICK, None))
+
+
+def _run_dispatcher():
+    # Java calls into Python on py4j callback server threads, all of them are
+    # queued here and run on the main thread so controllers never need locks.
+    # Everything queued is handled as a batch, ticks are merged into a single
+    # host_callback() with the MIDI of all of them.
+    while True:
+        batch = [_dispatch_queue.get()]
+
+        try:
+            while True:
+                batch.append(_dispatch_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        tick = False
+        midi = []
+
+        for kind, arg in batch:
+            if kind == _TICK:
+                tick = True
+                midi.extend(arg or ())
+            else:
+                _dispatch_call(arg)
+
+        if tick:
+            _dispatch_call(lambda: _host_callback(midi))
+
+
+def _dispatch_call(func: Callable):
+    try:
+        func()
+    except Exception as e:
+        log(repr(e))
+
+
+def _dispatch_sync(func: Callable):
+    # For Java calls that must not return before func() has run
+    done = threading.Event()
+
+    def call():
+        try:
+            func()
+        finally:
+            done.set()
+
+    _dispatch_queue.put((_CALL, call))
+    done.wait(_DISPATCH_SYNC_TIMEOUT_SEC)
+
+
+def _on_script_start():
+    with _callback_scope():
+        try:
+            _controller.on_script_start()
+        except AttributeError:
+            pass
+
+
+def _on_script_stop():
+    try:
+        _controller.on_script_stop()
+    except AttributeError:
+        pass
+
+
+def _on_project_load():
+    with _callback_scope():
+        rebuild_midi_cc_mappings()
+        try:
+            _controller.on_project_load()
+        except AttributeError:
+            pass
+
+
+def _host_callback(midi: List[bytes]):
+    global _in_host_callback
+    _in_host_callback = True
+    try:
+        with _callback_scope():
+            scheduler.run(lambda e: log(repr(e)))
+            try:
+                _controller.host_callback(
+                    apply_midi_cc_map(_midi_cc_map, midi, set_parameter_value))
+            except AttributeError:
+                pass
+    finally:
+        _in_host_callback = False
+    if scheduler.pending():
+        # Leftover or newly deferred work, tick again right away
+        _dispatch_queue.put((_TICK, None))
+
+
+def _split_midi(midi: bytes) -> List[bytes]:
+    # Java sends contiguous 3-byte messages, or None when there are none
+    if not midi:
+        return []
+
+    midi = bytes(midi)
+
+    # Slices copy on purpose, get_midi() promises bytes to scripts and a
+    # memoryview slice would keep the whole buffer alive
+    if not _midi_timestamps:
+        return [midi[i:i + 3] for i in range(0, len(midi), 3)]
+
+    # Java arrival times are moved to Python's monotonic clock using the time
+    # Java sent them at, bridge latency is not accounted for
+    now = time.monotonic()
+    sent_ns = _LONG.unpack_from(midi)[0]
+    events = []
+
+    for i in range(_LONG.size, len(midi), _TIMESTAMPED_MIDI.size):
+        arrived_ns = _LONG.unpack_from(midi, i + 3)[0]
+        events.append(TimestampedMidi(midi[i:i + 3], now - (sent_ns - arrived_ns) / 1e9, arrived_ns))
+
+    return events
+
+
+def _client_volume(volume: float) -> float:
+    return map_interp(volume, HOST_VOL, CLIENT_VOL)
+
+
+_CALL = 0
+_TICK = 1
+_DISPATCH_SYNC_TIMEOUT_SEC = 5
+
+# Matches PackedWriter.java
+_INT = struct.Struct(">i")
+_BOOL = struct.Struct(">?")
+_BYTE = struct.Struct(">B")
+_LONG = struct.Struct(">q")
+_DOUBLE = struct.Struct(">d")
+_STR_LEN = struct.Struct(">H")
+_TIMESTAMPED_MIDI = struct.Struct(">3sq")
+_TRACK_HEADER = struct.Struct(">ii")
+_TRACK_STATE = struct.Struct(">B?dd")
+_TRACK_TYPES = [TrackType.AUDIO, TrackType.MIDI, TrackType.OTHER]
+_ENABLED_STATES = [False, True, None]  # None until the plugin is subscribed
+_CHANGE_HEADER = struct.Struct(">iBB")
+_PROP_NAME = 0
+_PROP_TYPE = 1
+_PROP_MUTE = 2
+_PROP_VOLUME = 3
+_PROP_PAN = 4
+_PROP_ENABLED = 5
+_PROP_VALUE = 6
+_PROP_DISPLAY_VALUE = 7
+_VALUE_BOOLEAN = 0
+_VALUE_DOUBLE = 1
+_VALUE_STRING = 2
+
+# Observers that stay unsubscribed until subscribe(), see DawscriptExtension
+_LAZY_PROPS = (_PROP_ENABLED, _PROP_VALUE, _PROP_DISPLAY_VALUE)
+
+
+class _PackedReader:
+    def __init__(self, data: bytes):
+        self._data = data
+        self._offset = 0
+
+    def read(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self._data, self._offset)
+        self._offset += fmt.size
+        return values
+
+    def read_int(self) -> int:
+        return self.read(_INT)[0]
+
+    def read_bool(self) -> bool:
+        return self.read(_BOOL)[0]
+
+    def read_string(self) -> str:
+        length = self.read(_STR_LEN)[0]
+        start = self._offset
+        self._offset += length
+        return self._data[start:self._offset].decode("utf-8")
+
+    def at_end(self) -> bool:
+        return self._offset >= len(self._data)
 
 
 class Controller:
     def __init__(self, controller: ModuleType):
         self.controller = controller
 
+    # Called synchronously from setController() while main() waits for it,
+    # cannot go through the dispatcher
     def get_config(self):
+        global _midi_timestamps
         jconfig = gateway.jvm.java.util.HashMap()
         try:
             config = self.controller.get_config()
+            _midi_timestamps = bool(config.midi_timestamps)
             jconfig.put("midi_inputs", config.midi_inputs)
+            jconfig.put("idle_tick_rate", config.idle_tick_rate)
+            jconfig.put("midi_timestamps", _midi_timestamps)
+            table = compile_midi_filter(config.midi_filter)
+            if table is not None:
+                # bytes are converted to Java byte[]
+                jconfig.put("midi_filter_status", table.status)
+                jconfig.put("midi_filter_controls", table.controls)
+                jconfig.put("midi_filter_notes", table.notes)
         except AttributeError:
             jconfig.put("midi_inputs", ALL_MIDI_INPUTS)
         return jconfig
 
+    # Everything below is queued for the main thread, see _run_dispatcher()
+
     def on_script_start(self):
-        try:
-            self.controller.on_script_start()
-        except AttributeError:
-            pass
+        _dispatch_queue.put((_CALL, _on_script_start))
 
     def on_script_stop(self):
-        try:
-            self.controller.on_script_stop()
-        except AttributeError:
-            pass
+        _dispatch_sync(_on_script_stop)
 
     def on_project_load(self):
-        try:
-            self.controller.on_project_load()
-        except AttributeError:
-            pass
-
-    def host_callback(self, midi: List[bytes]):
-        try:
-            self.controller.host_callback(midi)
-        except AttributeError:
-            pass
+        _dispatch_queue.put((_CALL, _on_project_load))
 
-    class Java:
-        implements = ["dawscript.Controller"]
+    def update_mirror(self, changes: bytes):
+        _dispatch_queue.put((_CALL, lambda: _update_mirror(changes)))
 
-
-class PythonRunnable:
-    def __init__(self, callback: Callable):
-        self.callback = callback
-
-    def run(self):
-        self.callback()
+    def host_callback(self, midi: bytes):
+        _dispatch_queue.put((_TICK, _split_midi(midi)))
 
     class Java:
-        implements = ["dawscript.PythonRunnable"]
+        implements = ["dawscript.Controller"]
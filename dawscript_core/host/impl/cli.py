@@ -1,22 +1,66 @@
 # SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
 # SPDX-License-Identifier: MIT
 
-import jack
-import queue
 import os
 import signal
 import sys
 import time
 import threading
 from types import ModuleType
-from typing import Any, Callable, List, Tuple
-
-from ..types import AnyHandle, ParameterHandle, PluginHandle, TrackHandle, TrackType
+from typing import Any, Callable, Dict, List, Tuple
+
+from .cli_project import PROJECT_ENV, SimObject, SimTrack, load_project
+from .util import (
+    MidiFilterTable,
+    MidiRing,
+    WakeupSocket,
+    apply_midi_cc_map,
+    compile_midi_filter,
+    make_midi_cc_map,
+    map_interp,
+    midi_filter_accepts
+)
+from ..scheduler import Priority, scheduler
+from ..types import (
+    AnyHandle,
+    ParameterHandle,
+    PluginHandle,
+    TimestampedMidi,
+    TrackHandle,
+    TrackType
+)
+
+try:
+    import jack
+except (ImportError, OSError):
+    # Module or JACK library missing, the simulated project still works
+    jack = None
+
+IDLE_TICK_PERIOD = 1 / 30
+
+# Replays a session recorded with dawscript_core.extra.session instead of
+# reading JACK, then logs controller CPU time per tick. Speed 0 replays as
+# fast as possible.
+REPLAY_ENV = "DAWSCRIPT_CLI_REPLAY"
+REPLAY_SPEED_ENV = "DAWSCRIPT_CLI_REPLAY_SPEED"
+REPLAY_SAMPLE_RATE = 48000
+
+N_INF = float('-inf')
+HOST_VOL_DB = [N_INF,   -36,   -24,   -18,   -12,    -6,     0,     6,    12]
+HOST_VOL    = [0.000, 0.015, 0.063, 0.126, 0.251, 0.501, 1.000, 2.000, 4.000]
+CLIENT_VOL  = [0.000, 0.202, 0.316, 0.388, 0.480, 0.593, 0.720, 0.854, 1.000]
 
 _controller = None
-_jack_client: jack.Client = None
-_jack_midi_in: jack.OwnPort = None
-_midi_queue = queue.Queue()
+_tracks: List[SimTrack] = []
+_jack_client: "jack.Client" = None
+_jack_midi_in: "jack.OwnPort" = None
+_midi_ring = MidiRing()
+_midi_overflows = 0
+_midi_timestamps = False
+_frame_clock: Tuple[int, float] = (0, 0.0)
+_wakeup = WakeupSocket()
+_midi_filter: MidiFilterTable = None
+_midi_cc_map: Dict[Tuple[int, int], List[ParameterHandle]] = {}
 
 
 def name() -> str:
@@ -38,190 +82,335 @@ def display(message: str):
 
 
 def get_stable_object_id(handle: AnyHandle) -> str:
-    return handle
+    return handle.id
 
 
 def get_tracks() -> List[TrackHandle]:
-    log(f"stub: get_tracks()")
-    return []
+    return list(_tracks)
 
 
 def get_track_type(track: TrackHandle) -> TrackType:
-    log(f"stub: get_track_type( {track} )")
-    return TrackType.AUDIO
+    return track.type
 
 
 def get_track_name(track: TrackHandle) -> str:
-    log(f"stub: get_track_name( {track} )")
-    return ''
+    return track.name
 
 
 def is_track_mute(track: TrackHandle) -> bool:
-    log(f"stub: is_track_mute( {track} )")
-    return False
+    return track.mute
 
 
 def set_track_mute(track: TrackHandle, mute: bool):
-    log(f"stub: set_track_mute( {track} )")
+    _set(track, "mute", bool(mute))
 
 
 def add_track_mute_listener(track: TrackHandle, listener: Callable[[bool], None]):
-    log(f"stub: add_track_mute_listener( {track}, {listener} )")
+    _add_listener(track, "mute", listener)
 
 
 def remove_track_mute_listener(track: TrackHandle, listener: Callable[[bool], None]):
-    log(f"stub: remove_track_mute_listener( {track}, {listener} )")
+    _remove_listener(track, "mute", listener)
 
 
 def get_track_volume(track: TrackHandle) -> float:
-    log(f"stub: get_track_volume( {track} )")
-    return 0.0
+    return map_interp(track.volume, HOST_VOL, CLIENT_VOL)
 
 
 def set_track_volume(track: TrackHandle, volume: float):
-    log(f"stub: set_track_volume( {track}, {volume} )")
+    _set(track, "volume", map_interp(volume, CLIENT_VOL, HOST_VOL))
 
 
 def add_track_volume_listener(track: TrackHandle, listener: Callable[[float], None]):
-    log(f"stub: add_track_volume_listener( {track}, {listener} )")
+    _add_listener(track, "volume", lambda v: listener(map_interp(v, HOST_VOL, CLIENT_VOL)), listener)
 
 
 def remove_track_volume_listener(track: TrackHandle, listener: Callable[[float], None]):
-    log(f"stub: remove_track_volume_listener( {track}, {listener} )")
+    _remove_listener(track, "volume", listener)
 
 
 def get_track_pan(track: TrackHandle) -> float:
-    log(f"stub: get_track_pan( {track} )")
-    return 0.0
+    return track.pan
 
 
 def set_track_pan(track: TrackHandle, pan: float):
-    log(f"stub: set_track_pan( {track}, {pan} )")
+    _set(track, "pan", max(-1.0, min(1.0, float(pan))))
 
 
 def add_track_pan_listener(track: TrackHandle, listener: Callable[[float], None]):
-    log(f"stub: add_track_pan_listener( {track}, {listener} )")
+    _add_listener(track, "pan", listener)
 
 
 def remove_track_pan_listener(track: TrackHandle, listener: Callable[[float], None]):
-    log(f"stub: remove_track_pan_listener( {track}, {listener} )")
+    _remove_listener(track, "pan", listener)
 
 
 def get_track_plugins(track: TrackHandle) -> List[PluginHandle]:
-    log(f"stub: get_track_plugins( {track} )")
-    return []
+    return list(track.plugins)
 
 
 def get_plugin_name(plugin: PluginHandle) -> str:
-    log(f"stub: get_plugin_name( {plugin} )")
-    return ''
+    return plugin.name
 
 
 def is_plugin_enabled(plugin: PluginHandle) -> bool:
-    log(f"stub: is_plugin_enabled( {plugin} )")
-    return False
+    return plugin.enabled
 
 
 def set_plugin_enabled(plugin: PluginHandle, enabled: bool):
-    log(f"stub: set_plugin_enabled( {plugin}, {enabled} )")
+    _set(plugin, "enabled", bool(enabled))
 
 
 def add_plugin_enabled_listener(plugin: PluginHandle, listener: Callable[[bool], None]):
-    log(f"stub: add_plugin_enabled_listener( {plugin}, {listener} )")
+    _add_listener(plugin, "enabled", listener)
 
 
 def remove_plugin_enabled_listener(plugin: PluginHandle, listener: Callable[[bool], None]):
-    log(f"stub: remove_plugin_enabled_listener( {plugin}, {listener} )")
+    _remove_listener(plugin, "enabled", listener)
 
 
 def get_plugin_parameters(plugin: PluginHandle) -> List[ParameterHandle]:
-    log(f"stub: get_plugin_parameters( {plugin} )")
-    return []
+    return list(plugin.parameters)
 
 
 def get_parameter_name(param: ParameterHandle) -> str:
-    log(f"stub: get_parameter_name( {param} )")
-    return ''
+    return param.name
 
 
 def get_parameter_range(param: ParameterHandle) -> Tuple[float, float]:
-    log(f"stub: get_parameter_range( {param} )")
-    return (0, 1.0)
+    return (param.min, param.max)
 
 
 def get_parameter_value(param: ParameterHandle) -> float:
-    log(f"stub: get_parameter_value( {param} )")
-    return 0.0
+    return param.value
 
 
 def set_parameter_value(param: ParameterHandle, value: float):
-    log(f"stub: set_parameter_value( {param}, {value} )")
+    if _set(param, "value", max(param.min, min(param.max, float(value)))):
+        _notify(param, "dpy_value", param.display_value())
+
+
+def get_parameter_normalized_value(param: ParameterHandle) -> float:
+    span = param.max - param.min
+    return (param.value - param.min) / span if span else 0.0
+
+
+def set_parameter_normalized_value(param: ParameterHandle, value: float):
+    set_parameter_value(param, param.min + value * (param.max - param.min))
 
 
 def add_parameter_value_listener(
     param: ParameterHandle, listener: Callable[[float], None]
 ):
-    log(f"stub: add_parameter_value_listener( {param}, {listener} )")
+    _add_listener(param, "value", listener)
 
 
 def remove_parameter_value_listener(
     param: ParameterHandle, listener: Callable[[float], None]
 ):
-    log(f"stub: remove_parameter_value_listener( {param}, {listener} )")
+    _remove_listener(param, "value", listener)
 
 
 def get_parameter_display_value(param: ParameterHandle) -> str:
-    log(f"stub: get_parameter_display_value( {param} )")
-    return ''
+    return param.display_value()
 
 
 def add_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None]):
-    log(f"stub: add_parameter_display_value_listener( {param}, {listener} )")
+    _add_listener(param, "dpy_value", listener)
 
 
 def remove_parameter_display_value_listener(param: ParameterHandle, listener: Callable[[str],None]):
-    log(f"stub: remove_parameter_display_value_listener( {param}, {listener} )")
+    _remove_listener(param, "dpy_value", listener)
+
+
+def rebuild_midi_cc_mappings():
+    _midi_cc_map.clear()
+
+    try:
+        _midi_cc_map.update(make_midi_cc_map(_controller.get_midi_cc_mappings()))
+    except AttributeError:
+        pass
 
 
 def _run_loop():
-    global _jack_client, _jack_midi_in
+    global _jack_client, _jack_midi_in, _midi_filter, _midi_timestamps
 
     ev_port_reg = threading.Event()
     ev_quit = threading.Event()
 
+    _tracks[:] = load_project(os.environ.get(PROJECT_ENV),
+                              lambda v: map_interp(v, CLIENT_VOL, HOST_VOL))
+
+    replay_path = os.environ.get(REPLAY_ENV)
+
+    if jack is not None and not replay_path:
+        try:
+            _jack_client = jack.Client(
+                f"dawscript_{os.urandom(2).hex()}", no_start_server=True
+            )
+        except jack.JackOpenError:
+            _jack_client = None
+
+    if _jack_client is None and not replay_path:
+        if not _tracks:
+            log(f"JACK not available and no project in {PROJECT_ENV}")
+            sys.exit(1)
+        log("JACK not available, running without MIDI input")
+
     try:
-        _jack_client = jack.Client(
-            f"dawscript_{os.urandom(2).hex()}", no_start_server=True
-        )
-    except jack.JackOpenError:
-        sys.exit(1)
+        _midi_filter = compile_midi_filter(_controller.get_config().midi_filter)
+    except AttributeError:
+        _midi_filter = None
+
+    if _jack_client is not None:
+        _jack_midi_in = _jack_client.midi_inports.register(f"input")
+        _jack_client.set_process_callback(_jack_proc)
+        _jack_client.set_port_registration_callback(lambda p, r: _set_events(ev_port_reg, _wakeup))
+        _jack_client.activate()
+
+    try:
+        config = _controller.get_config()
+        idle_tick_rate, max_tick_rate = config.idle_tick_rate, config.max_tick_rate
+        _midi_timestamps = bool(config.midi_timestamps)
+    except AttributeError:
+        idle_tick_rate, max_tick_rate = None, None
 
-    _jack_midi_in = _jack_client.midi_inports.register(f"input")
-    _jack_client.set_process_callback(_jack_proc)
-    _jack_client.set_port_registration_callback(lambda p, r: ev_port_reg.set())
-    _jack_client.activate()
+    if idle_tick_rate is None:
+        idle_period = IDLE_TICK_PERIOD
+    else:
+        idle_period = 1 / idle_tick_rate if idle_tick_rate > 0 else None
 
-    signal.signal(signal.SIGINT, lambda sig, frame: ev_quit.set())
+    min_period = 1 / max_tick_rate if max_tick_rate else 0
+
+    scheduler.set_wakeup(_wakeup.set)
+
+    signal.signal(signal.SIGINT, lambda sig, frame: _set_events(ev_quit, _wakeup))
 
     try:
         _controller.on_script_start()
     except AttributeError:
         pass
 
-    while not ev_quit.is_set():
+    rebuild_midi_cc_mappings()
+
+    try:
+        _controller.on_project_load()
+    except AttributeError:
+        pass
+
+    if replay_path:
+        _replay(replay_path, float(os.environ.get(REPLAY_SPEED_ENV, 1)), ev_quit)
+
+    # Sleeps until MIDI arrives, work is deferred or the idle period elapses
+    while not ev_quit.is_set() and not replay_path:
+        _wakeup.wait(idle_period)
+        _wakeup.clear()
+        tick_time = time.monotonic()
         if ev_port_reg.is_set():
             ev_port_reg.clear()
             _connect_ports()
-        _controller.host_callback(_read_midi_events())
-        time.sleep(1 / 30)
+        if scheduler.run(lambda e: log(repr(e))):
+            _wakeup.set()
+        midi = apply_midi_cc_map(_midi_cc_map, _read_midi_events(), set_parameter_normalized_value)
+        _controller.host_callback(midi)
+        if min_period > 0:
+            time.sleep(max(0, tick_time + min_period - time.monotonic()))
+
+    if _jack_client is not None:
+        _jack_client.deactivate()
+        _jack_client.close()
+
+
+def _set(obj: SimObject, prop: str, value: Any) -> bool:
+    if getattr(obj, prop) == value:
+        return False
+
+    setattr(obj, prop, value)
+    _notify(obj, prop, value)
+
+    return True
+
+
+def _notify(obj: SimObject, prop: str, value: Any):
+    # Like DAW backends, listeners run on the next tick rather than inside the
+    # setter
+    listeners = obj.listeners.get(prop)
+
+    if listeners:
+        for listener, _ in listeners:
+            scheduler.post(lambda l=listener: l(value), Priority.HIGH)
+        scheduler.wakeup()
+
+
+def _add_listener(obj: SimObject, prop: str, listener: Callable, key: Callable = None):
+    # key identifies wrapped listeners for removal
+    obj.listeners.setdefault(prop, []).append((listener, key or listener))
+
+
+def _remove_listener(obj: SimObject, prop: str, listener: Callable):
+    listeners = obj.listeners.get(prop, [])
+    listeners[:] = [(l, k) for l, k in listeners if k != listener]
+
 
-    _jack_client.deactivate()
-    _jack_client.close()
+def _replay(path: str, speed: float, ev_quit: threading.Event):
+    from dawscript_core.extra.session import Replayer, replay_stats
+
+    # Batches were recorded as delivered, filtering and CC mappings already
+    # applied
+    cpu_us = []
+    messages = 0
+    start = time.monotonic()
+
+    for tick_time, midi in Replayer(path).ticks(_midi_timestamps):
+        if speed > 0:
+            delay = start + tick_time / speed - time.monotonic()
+            if delay > 0:
+                ev_quit.wait(delay)
+        if ev_quit.is_set():
+            break
+        if _midi_timestamps:
+            # source_time in frames like JACK, recorded times carry no frames
+            midi = [TimestampedMidi(m.data, start + m.time / speed if speed > 0 else time.monotonic(),
+                                    round(m.time * REPLAY_SAMPLE_RATE)) for m in midi]
+        messages += len(midi)
+        cpu_start = time.thread_time()
+        scheduler.run(lambda e: log(repr(e)))
+        _controller.host_callback(midi)
+        cpu_us.append((time.thread_time() - cpu_start) * 1e6)
+
+    stats = replay_stats(cpu_us, messages)
+    log(f"replayed {stats.ticks} ticks, {stats.messages} messages, CPU per tick: "
+        f"mean {stats.mean_us:.1f} us, p50 {stats.p50_us:.1f} us, "
+        f"p99 {stats.p99_us:.1f} us, max {stats.max_us:.1f} us")
+
+
+def _set_events(*events: threading.Event):
+    for event in events:
+        event.set()
 
 
 def _jack_proc(frames: int):
+    # JACK real-time thread. Messages are copied into preallocated ring slots
+    # and the main loop is woken through a socket write, no locks are taken
+    # besides the GIL, which any Python callback needs.
+    global _frame_clock
+
+    accept = _midi_filter_accepts if _midi_filter is not None else None
+    cycle_frame = _jack_client.last_frame_time
+    pushed = False
+
     for offset, data in _jack_midi_in.incoming_midi_events():
-        _midi_queue.put_nowait(bytes(data))
+        pushed |= _midi_ring.push(data, cycle_frame + offset, accept)
+
+    if pushed:
+        if _midi_timestamps:
+            # Reference for converting frame times to monotonic time
+            _frame_clock = (cycle_frame, time.monotonic())
+        _wakeup.set()
+
+
+def _midi_filter_accepts(slot: memoryview, size: int) -> bool:
+    return midi_filter_accepts(_midi_filter, slot, size)
 
 
 def _connect_ports():
@@ -244,9 +433,23 @@ def _connect_ports():
 
 
 def _read_midi_events():
+    global _midi_overflows
+
     events = list()
 
-    while _midi_queue.qsize() > 0:
-        events.append(_midi_queue.get_nowait())
+    if _jack_client is None:
+        return events  # no MIDI input without JACK
+
+    if _midi_timestamps:
+        ref_frame, ref_time = _frame_clock
+        sample_rate = _jack_client.samplerate
+        _midi_ring.drain(lambda data, frame: events.append(TimestampedMidi(
+            bytes(data), ref_time + (frame - ref_frame) / sample_rate, frame)))
+    else:
+        _midi_ring.drain(lambda data, frame: events.append(bytes(data)))
+
+    if _midi_ring.overflows != _midi_overflows:
+        log(f"MIDI input overflow, {_midi_ring.overflows - _midi_overflows} messages dropped")
+        _midi_overflows = _midi_ring.overflows
 
     return events
@@ -0,0 +1,166 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..types import TrackType
+
+# In-memory project for the CLI backend, loaded from the path or generator
+# spec in DAWSCRIPT_CLI_PROJECT:
+#
+#   project.json, project.yaml    see load_project()
+#   synthetic:1000                1000 tracks, 4 plugins, 8 parameters each
+#   synthetic:1000:2:16           1000 tracks, 2 plugins, 16 parameters each
+#
+# JSON/YAML description, every key is optional:
+#
+#   tracks:
+#     - name: Bass
+#       type: midi                audio, midi or other
+#       mute: false
+#       volume: 0.8               client fader value [0,1]
+#       pan: 0.0                  [-1,1]
+#       plugins:
+#         - name: EQ
+#           enabled: true
+#           parameters:
+#             - name: Gain
+#               range: [-12, 12]
+#               value: 0
+#               unit: dB
+
+PROJECT_ENV = "DAWSCRIPT_CLI_PROJECT"
+
+_TRACK_TYPES = {"audio": TrackType.AUDIO, "midi": TrackType.MIDI, "other": TrackType.OTHER}
+
+
+class SimObject:
+    __slots__ = ("id", "listeners")
+
+    def __init__(self, obj_id: str):
+        self.id = obj_id
+        self.listeners: Dict[str, List[Tuple[Callable, Callable]]] = {}  # (listener, key)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.id})"
+
+
+class SimParameter(SimObject):
+    __slots__ = ("name", "min", "max", "value", "unit")
+
+    def __init__(self, obj_id: str, name: str, min_value: float, max_value: float,
+                 value: float, unit: str):
+        super().__init__(obj_id)
+        self.name = name
+        self.min = min_value
+        self.max = max_value
+        self.value = value
+        self.unit = unit
+
+    def display_value(self) -> str:
+        return f"{self.value:.2f} {self.unit}" if self.unit else f"{self.value:.2f}"
+
+
+class SimPlugin(SimObject):
+    __slots__ = ("name", "enabled", "parameters")
+
+    def __init__(self, obj_id: str, name: str, enabled: bool, parameters: List[SimParameter]):
+        super().__init__(obj_id)
+        self.name = name
+        self.enabled = enabled
+        self.parameters = parameters
+
+
+class SimTrack(SimObject):
+    __slots__ = ("name", "type", "mute", "volume", "pan", "plugins")
+
+    def __init__(self, obj_id: str, name: str, track_type: TrackType, mute: bool,
+                 volume: float, pan: float, plugins: List[SimPlugin]):
+        super().__init__(obj_id)
+        self.name = name
+        self.type = track_type
+        self.mute = mute
+        self.volume = volume  # host scale, see cli.HOST_VOL
+        self.pan = pan
+        self.plugins = plugins
+
+
+def load_project(spec: str, client_to_host_volume: Callable[[float], float]) -> List[SimTrack]:
+    if not spec:
+        return []
+
+    if spec.startswith("synthetic:"):
+        counts = [int(n) for n in spec.split(":")[1:]]
+        return generate_project(*counts, client_to_host_volume=client_to_host_volume)
+
+    with open(os.path.expanduser(spec), encoding="utf-8") as f:
+        if spec.endswith((".yaml", ".yml")):
+            import yaml # type: ignore
+            description = yaml.safe_load(f)
+        else:
+            description = json.load(f)
+
+    return _build_tracks(description or {}, client_to_host_volume)
+
+
+def generate_project(num_tracks: int, num_plugins: int = 4, num_params: int = 8, *,
+                     client_to_host_volume: Callable[[float], float]) -> List[SimTrack]:
+    types = list(_TRACK_TYPES)
+    description = {"tracks": [{
+        "name": f"Track {t + 1}",
+        "type": types[t % 2],
+        "volume": 0.72,
+        "plugins": [{
+            "name": f"Plugin {p + 1}",
+            "parameters": [{
+                "name": f"Param {k + 1}",
+                "range": [0.0, 100.0],
+                "value": (k * 100.0 / num_params) if num_params else 0.0,
+                "unit": "%"
+            } for k in range(num_params)]
+        } for p in range(num_plugins)]
+    } for t in range(num_tracks)]}
+
+    return _build_tracks(description, client_to_host_volume)
+
+
+def _build_tracks(description: Dict[str, Any], client_to_host_volume: Callable[[float], float]) -> List[SimTrack]:
+    tracks = []
+
+    for t, track in enumerate(description.get("tracks", [])):
+        plugins = []
+
+        for p, plugin in enumerate(track.get("plugins", [])):
+            parameters = []
+
+            for k, param in enumerate(plugin.get("parameters", [])):
+                min_value, max_value = param.get("range", (0.0, 1.0))
+                parameters.append(SimParameter(
+                    f"t{t}p{p}k{k}",
+                    param.get("name", f"Param {k + 1}"),
+                    float(min_value),
+                    float(max_value),
+                    float(param.get("value", min_value)),
+                    param.get("unit", "")
+                ))
+
+            plugins.append(SimPlugin(
+                f"t{t}p{p}",
+                plugin.get("name", f"Plugin {p + 1}"),
+                bool(plugin.get("enabled", True)),
+                parameters
+            ))
+
+        tracks.append(SimTrack(
+            f"t{t}",
+            track.get("name", f"Track {t + 1}"),
+            _TRACK_TYPES[track.get("type", "audio").lower()],
+            bool(track.get("mute", False)),
+            client_to_host_volume(float(track.get("volume", 0.72))),
+            float(track.get("pan", 0.0)),
+            plugins
+        ))
+
+    return tracks
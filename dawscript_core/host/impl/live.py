@@ -2,15 +2,18 @@
 # SPDX-License-Identifier: MIT
 
 import sys
+import time
 from types import ModuleType
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Set, Tuple
 
-from .util import map_interp
+from .util import compile_midi_filter, map_interp, midi_filter_accepts
+from ..scheduler import Priority, scheduler
 from ..types import (
     AnyHandle,
     IncompatibleEnvironmentError,
     ParameterHandle,
     PluginHandle,
+    TimestampedMidi,
     TrackHandle,
     TrackType
 )
@@ -28,6 +31,12 @@ CLIENT_VOL  = [0.000, 0.058, 0.112, 0.172, 0.236, 0.310, 0.399, 0.498, 0.601, 0.
 
 _control_surface = None
 
+# Lookup caches keyed by _live_ptr, Python wrappers for the same Live object
+# are not guaranteed to be identical. Invalidated by Live listeners.
+_track_types: Dict[int, TrackType] = {}
+_return_tracks: Set[int] = None
+_device_on: Dict[int, Dict[int, ParameterHandle]] = {}
+
 
 def name() -> str:
     return "live"
@@ -36,6 +45,8 @@ def name() -> str:
 def main(controller: ModuleType, context: Any):
     global _control_surface
     _control_surface = context
+    _clear_caches()
+    _control_surface.watch_song_tracks(_invalidate_track_types)
     _control_surface.set_controller(controller)
 
 
@@ -81,12 +92,26 @@ def get_tracks() -> List[TrackHandle]:
 
 
 def get_track_type(track: TrackHandle) -> TrackType:
-    if track in _control_surface.song().return_tracks or track.is_foldable:
-        return TrackType.OTHER
+    global _return_tracks
+
+    track_type = _track_types.get(track._live_ptr)
+
+    if track_type is not None:
+        return track_type
+
+    if _return_tracks is None:
+        _return_tracks = set(t._live_ptr for t in _control_surface.song().return_tracks)
+
+    if track._live_ptr in _return_tracks or track.is_foldable:
+        track_type = TrackType.OTHER
     elif track.has_midi_input:
-        return TrackType.MIDI
+        track_type = TrackType.MIDI
     else:
-        return TrackType.AUDIO
+        track_type = TrackType.AUDIO
+
+    _track_types[track._live_ptr] = track_type
+
+    return track_type
 
 
 def get_track_name(track: TrackHandle) -> str:
@@ -215,6 +240,15 @@ def set_parameter_value(param: ParameterHandle, value: float):
     param.value = value
 
 
+def get_parameter_normalized_value(param: ParameterHandle) -> float:
+    span = param.max - param.min
+    return (param.value - param.min) / span if span else 0.0
+
+
+def set_parameter_normalized_value(param: ParameterHandle, value: float):
+    set_parameter_value(param, param.min + value * (param.max - param.min))
+
+
 def add_parameter_value_listener(
     param: ParameterHandle, listener: Callable[[float], None]
 ):
@@ -257,17 +291,48 @@ def remove_parameter_display_value_listener(
     _control_surface.remove_listener(param, "dpy_value", listener)
 
 
+def rebuild_midi_cc_mappings():
+    _control_surface.request_rebuild_midi_map()
+
+
 def _get_document():
     return Live.Application.get_application().get_document()
 
 
 def _get_parameter_device_on(plugin: PluginHandle) -> ParameterHandle:
+    parent = plugin.canonical_parent
+    device_on = _device_on.get(parent._live_ptr)
+
+    if device_on is None:
+        device_on = {}
+        _device_on[parent._live_ptr] = device_on
+        _control_surface.watch_devices(parent, _invalidate_device_on)
+    elif plugin._live_ptr in device_on:
+        return device_on[plugin._live_ptr]
+
     for param in plugin.parameters:
         if param.name == 'Device On':
+            device_on[plugin._live_ptr] = param
             return param
+
     return None
 
 
+def _invalidate_track_types():
+    global _return_tracks
+    _return_tracks = None
+    _track_types.clear()
+
+
+def _invalidate_device_on(parent):
+    _device_on.pop(parent._live_ptr, None)
+
+
+def _clear_caches():
+    _invalidate_track_types()
+    _device_on.clear()
+
+
 def _d2b_hash(string):
     hash_value = 0
     for char in string:
@@ -284,32 +349,53 @@ class DawscriptControlSurface(ControlSurface):
 
         self._cleanup_cb: Dict[Any, Callable] = {}
         self._events: List[bytes] = []
-        self._deferred: List[Callable] = []
+        self._midi_filter = None
+        self._midi_timestamps = False
+        self._controller = None
 
         self.request_rebuild_midi_map()
 
     def build_midi_map(self, midi_map_handle):
         script_handle = self._c_instance.handle()
+        table = self._midi_filter
+        mapped = set()
+
+        try:
+            mappings = self._controller.get_midi_cc_mappings()
+        except AttributeError:
+            mappings = []
+
+        for mapping in mappings:
+            # Mapped CCs are handled by Live and never reach receive_midi()
+            if Live.MidiMap.map_midi_cc(midi_map_handle, mapping.param, mapping.channel,
+                                        mapping.control, Live.MidiMap.MapMode.absolute, True):
+                mapped.add((mapping.channel, mapping.control))
+            else:
+                log(f"build_midi_map(): could not map CC {mapping.control} on channel {mapping.channel}")
 
         for ch in range(0, 16):
+            # Only forward what the filter can accept, Live drops the rest
+            fwd_note = table is None or table.status[0x80 | ch] or table.status[0x90 | ch]
+            fwd_cc = table is None or table.status[0xB0 | ch]
             for i in range(0, 128):
-                Live.MidiMap.forward_midi_note(script_handle, midi_map_handle, ch, i)
-                Live.MidiMap.forward_midi_cc(script_handle, midi_map_handle, ch, i)
+                if fwd_note and (table is None or table.notes[i]):
+                    Live.MidiMap.forward_midi_note(script_handle, midi_map_handle, ch, i)
+                if fwd_cc and (table is None or table.controls[i]) and (ch, i) not in mapped:
+                    Live.MidiMap.forward_midi_cc(script_handle, midi_map_handle, ch, i)
 
     def receive_midi(self, midi_bytes):
         try:
-            self._events.append(bytes(midi_bytes))
+            msg = bytes(midi_bytes)
+            if self._midi_filter is None or midi_filter_accepts(self._midi_filter, msg):
+                if self._midi_timestamps:
+                    # Live provides no timestamps, arrival time is the best guess
+                    msg = TimestampedMidi(msg, time.monotonic(), None)
+                self._events.append(msg)
         except Exception as e:
             log(repr(e))
 
     def update_display(self):
-        for func in self._deferred:
-            try:
-                func()
-            except Exception as e:
-                log(repr(e))
-
-        self._deferred.clear()
+        scheduler.run(lambda e: log(repr(e)))
 
         try:
             host_callback = self._controller.host_callback
@@ -332,11 +418,25 @@ class DawscriptControlSurface(ControlSurface):
         for callback in self._cleanup_cb.values():
             callback()
 
+        _clear_caches()
+
         super(DawscriptControlSurface, self).disconnect()
 
     def set_controller(self, controller):
         self._controller = controller
 
+        try:
+            self._midi_filter = compile_midi_filter(self._controller.get_config().midi_filter)
+        except AttributeError:
+            self._midi_filter = None
+
+        try:
+            self._midi_timestamps = bool(self._controller.get_config().midi_timestamps)
+        except AttributeError:
+            self._midi_timestamps = False
+
+        self.request_rebuild_midi_map()
+
         try:
             self._controller.on_script_start()
         except AttributeError:
@@ -348,6 +448,29 @@ class DawscriptControlSurface(ControlSurface):
         except AttributeError:
             pass
 
+    def watch_song_tracks(self, callback):
+        song = self.song()
+        song.add_tracks_listener(callback)
+        song.add_return_tracks_listener(callback)
+
+        def remove():
+            song.remove_tracks_listener(callback)
+            song.remove_return_tracks_listener(callback)
+
+        self._cleanup_cb["song_tracks_cache"] = remove
+
+    def watch_devices(self, parent, callback):
+        key = f"{parent._live_ptr}_devices_cache"
+
+        if key in self._cleanup_cb:
+            return
+
+        def devices_listener():
+            callback(parent)
+
+        self._cleanup_cb[key] = lambda: parent.remove_devices_listener(devices_listener)
+        parent.add_devices_listener(devices_listener)
+
     def add_listener(self, target, prop, listener, getter, add_func, remove_func):
         key_tp = f"{repr(target)}_{prop}"
 
@@ -356,7 +479,7 @@ class DawscriptControlSurface(ControlSurface):
 
         def def_listener():
             # Changes cannot be triggered by notifications. You will need to defer your response.
-            return self._deferred.append(lambda: listener(bound_getter()))
+            scheduler.post(lambda: listener(bound_getter()), Priority.HIGH)
 
         self._cleanup_cb[key_tp] = lambda: remove_func(def_listener)
         add_func(def_listener)
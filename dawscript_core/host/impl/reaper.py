@@ -2,23 +2,34 @@
 # SPDX-License-Identifier: MIT
 
 import sys
+import time
 from ctypes import *
 from types import ModuleType
 from typing import Any, Callable, Dict, List, Tuple
 
-from .util import map_interp
+from .util import (
+    MidiFilterTable,
+    apply_midi_cc_map,
+    compile_midi_filter,
+    make_midi_cc_map,
+    map_interp,
+    midi_filter_accepts
+)
+from ..scheduler import Priority, scheduler
 from ..types import (
     AnyHandle,
     IncompatibleEnvironmentError,
     ParameterHandle,
     PluginHandle,
     PluginNotFoundError,
+    TimestampedMidi,
     TrackHandle,
     TrackType
 )
 
 try:
     from reaper_python import ( # type: ignore
+        RPR_GetAudioDeviceInfo,
         RPR_GetMediaTrackInfo_Value,
         RPR_GetMIDIInputName,
         RPR_GetTrack,
@@ -57,6 +68,10 @@ RPR_defer = None
 _controller = None
 _proj_path = None
 _event_n = 0
+_midi_filter: MidiFilterTable = None
+_midi_timestamps = False
+_sample_rate = 0.0
+_midi_cc_map: Dict[Tuple[int, int], List[ParameterHandle]] = {}
 _listeners: Dict[str, List[Callable]] = {}
 _getters: Dict[str, Callable] = {}
 _state: Dict[str, Any] = {}
@@ -67,11 +82,27 @@ def name() -> str:
 
 
 def main(controller: ModuleType, context: Any):
-    global _controller, RPR_defer
+    global _controller, _midi_filter, _midi_timestamps, _sample_rate, RPR_defer
     _controller = controller
     RPR_defer = context["RPR_defer"]
     RPR_atexit = context["RPR_atexit"]
 
+    try:
+        _midi_filter = compile_midi_filter(_controller.get_config().midi_filter)
+    except AttributeError:
+        _midi_filter = None
+
+    try:
+        _midi_timestamps = bool(_controller.get_config().midi_timestamps)
+    except AttributeError:
+        _midi_timestamps = False
+
+    if _midi_timestamps:
+        try:
+            _sample_rate = float(RPR_GetAudioDeviceInfo("SRATE", "", 64)[2])
+        except ValueError:
+            _sample_rate = 0.0
+
     RPR_atexit("from dawscript_core.host import reaper; reaper.cleanup()")
 
     try:
@@ -83,7 +114,7 @@ def main(controller: ModuleType, context: Any):
 
 
 def cleanup():
-    global _controller, _proj_path, _event_n
+    global _controller, _proj_path, _event_n, _midi_filter, _midi_timestamps
 
     try:
         _controller.on_script_stop()
@@ -93,6 +124,9 @@ def cleanup():
     _controller = None
     _proj_path = None
     _event_n = 0
+    _midi_filter = None
+    _midi_timestamps = False
+    _midi_cc_map.clear()
     _listeners.clear()
     _getters.clear()
     _state.clear()
@@ -249,6 +283,14 @@ def set_parameter_value(param: ParameterHandle, value: float):
     RPR_TrackFX_SetParamNormalized(*param, value)
 
 
+def get_parameter_normalized_value(param: ParameterHandle) -> float:
+    return get_parameter_value(param)
+
+
+def set_parameter_normalized_value(param: ParameterHandle, value: float):
+    set_parameter_value(param, value)
+
+
 def add_parameter_value_listener(
     param: ParameterHandle, listener: Callable[[float], None]
 ):
@@ -277,22 +319,34 @@ def remove_parameter_display_value_listener(
     _remove_listener(param, "dpy_value", listener)
 
 
+def rebuild_midi_cc_mappings():
+    _midi_cc_map.clear()
+
+    try:
+        _midi_cc_map.update(make_midi_cc_map(_controller.get_midi_cc_mappings()))
+    except AttributeError:
+        pass
+
+
 def _tick():
     global _proj_path
 
     try:
         _call_listeners()
+        scheduler.run(lambda e: log(repr(e)))
 
         try:
             # Ignore default startup project when running as a global script
             proj_path = RPR_GetProjectPath("", 256)[0]
             if _proj_path != proj_path and not proj_path.endswith("REAPER Media"):
                 _proj_path = proj_path
+                rebuild_midi_cc_mappings()
                 _controller.on_project_load()
         except AttributeError:
             pass
         try:
-            _controller.host_callback(_read_midi_events())
+            midi = apply_midi_cc_map(_midi_cc_map, _read_midi_events(), set_parameter_value)
+            _controller.host_callback(midi)
         except AttributeError:
             pass
     except Exception as e:
@@ -306,6 +360,18 @@ def _read_midi_events():
     events = list()
     i = 0
 
+    try:
+        midi_inputs = _controller.get_config().midi_inputs
+    except AttributeError:
+        midi_inputs = None
+
+    if isinstance(midi_inputs, list):
+        midi_ins = [name.lower() for name in midi_inputs]
+    else:
+        midi_ins = None
+
+    read_time = time.monotonic() if _midi_timestamps else 0.0
+
     while True:
         event = RPR_MIDI_GetRecentInputEvent(i, None, 3, 0, 0, 0.0, 0)
         if event[0] <= _event_n:
@@ -314,22 +380,24 @@ def _read_midi_events():
         _event_n = event[0]
         i += 1
 
-        accept: bool
+        msg = bytes(event[2])
 
-        try:
-            config = _controller.get_config()
-
-            if isinstance(config.midi_inputs, list):
-                event_midi_in = RPR_GetMIDIInputName(event[5], None, 32)[2].lower()
-                midi_ins = [name.lower() for name in config.midi_inputs]
-                accept = any(map(lambda midi_in: midi_in in event_midi_in, midi_ins))
-            else:
-                accept = True
-        except AttributeError:
-            pass
+        # Status byte table lookup is cheaper than resolving the input name
+        if _midi_filter is not None and not midi_filter_accepts(_midi_filter, msg):
+            continue
+
+        if midi_ins is not None:
+            event_midi_in = RPR_GetMIDIInputName(event[5], None, 32)[2].lower()
+            if not any(map(lambda midi_in: midi_in in event_midi_in, midi_ins)):
+                continue
 
-        if accept:
-            events.append(bytes(event[2]))
+        if _midi_timestamps:
+            # ts is in samples relative to now, eg. -48000 is one second ago
+            ts = event[4]
+            events.append(TimestampedMidi(
+                msg, read_time + ts / _sample_rate if _sample_rate > 0 else read_time, ts))
+        else:
+            events.append(msg)
 
     return events
 
@@ -365,7 +433,7 @@ def _call_listeners():
         if now != _state[key_tp]:
             _state[key_tp] = now
             for listener in _listeners[key_tp]:
-                listener(now)
+                scheduler.post(lambda l=listener, v=now: l(v), Priority.HIGH)
 
 
 """
@@ -1,6 +1,15 @@
 # SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
 # SPDX-License-Identifier: MIT
 
+import select
+import socket
+import struct
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..types import TimestampedMidi
+
+
 def map_interp(n, x_val, y_val):
     """
     Maps a value n from one set of values (x_val) to another (y_val) using linear interpolation.
@@ -35,3 +44,246 @@ def map_interp(n, x_val, y_val):
             return round(result, 3)
     
     return None  # Return None if n is outside the interpolation range
+
+
+MIDI_STATUS = {
+    "note_off": 0x80,
+    "note_on": 0x90,
+    "polytouch": 0xA0,
+    "control_change": 0xB0,
+    "program_change": 0xC0,
+    "aftertouch": 0xD0,
+    "pitchwheel": 0xE0,
+}
+
+# System messages carry no channel, names as in mido
+MIDI_SYSTEM_STATUS = {
+    "sysex": 0xF0,
+    "quarter_frame": 0xF1,
+    "songpos": 0xF2,
+    "song_select": 0xF3,
+    "tune_request": 0xF6,
+    "clock": 0xF8,
+    "start": 0xFA,
+    "continue": 0xFB,
+    "stop": 0xFC,
+    "active_sensing": 0xFE,
+    "reset": 0xFF,
+}
+
+MidiFilterTable = namedtuple("MidiFilterTable", ["status", "controls", "notes"])
+
+
+def compile_midi_filter(midi_filter) -> Optional[MidiFilterTable]:
+    """
+    Compiles a MidiFilter into lookup tables indexed by status byte, control
+    number and note number. Returns None when the filter accepts everything.
+    Raises ValueError for unknown message type names.
+    """
+    if midi_filter is None or all(f is None for f in midi_filter):
+        return None
+
+    types = MIDI_STATUS.keys() if midi_filter.types is None else midi_filter.types
+    channels = range(16) if midi_filter.channels is None else midi_filter.channels
+
+    status = bytearray(256)
+    controls = bytearray(b"\x01" * 128) if midi_filter.controls is None else bytearray(128)
+    notes = bytearray(b"\x01" * 128) if midi_filter.notes is None else bytearray(128)
+
+    for type in types:
+        if type in MIDI_STATUS:
+            for ch in channels:
+                status[MIDI_STATUS[type] | ch] = 1
+        elif type in MIDI_SYSTEM_STATUS:
+            status[MIDI_SYSTEM_STATUS[type]] = 1
+        else:
+            raise ValueError(f"unknown MIDI message type {type!r}")
+
+    if midi_filter.types is None:
+        # System messages carry no channel
+        status[0xF0:0x100] = b"\x01" * 16
+
+    for cc in midi_filter.controls or []:
+        controls[cc] = 1
+
+    for note in midi_filter.notes or []:
+        notes[note] = 1
+
+    return MidiFilterTable(bytes(status), bytes(controls), bytes(notes))
+
+
+_LAYOUT_COUNT = struct.Struct(">i")
+_LAYOUT_MASK = struct.Struct(">I")
+
+
+def unpack_project_layout(data: bytes) -> List[List[int]]:
+    """
+    Decodes DawscriptExtension.getProjectLayout(): track count, then per
+    track the device count, then per device a 32-bit mask of parameter slots.
+    Masks are unsigned so slot 31 does not turn them negative.
+    """
+    offset = 0
+
+    def read(fmt: struct.Struct) -> int:
+        nonlocal offset
+        value = fmt.unpack_from(data, offset)[0]
+        offset += fmt.size
+        return value
+
+    return [[read(_LAYOUT_MASK) for _ in range(read(_LAYOUT_COUNT))]
+            for _ in range(read(_LAYOUT_COUNT))]
+
+
+def mask_indices(mask: int) -> List[int]:
+    return [k for k in range(mask.bit_length()) if mask & (1 << k)]
+
+
+def make_midi_cc_map(mappings) -> Dict[Tuple[int, int], List[Any]]:
+    cc_map = {}
+
+    for mapping in mappings or []:
+        cc_map.setdefault((mapping.channel, mapping.control), []).append(mapping.param)
+
+    return cc_map
+
+
+def apply_midi_cc_map(cc_map: Dict[Tuple[int, int], List[Any]], midi: List[bytes],
+                      set_value: Callable[[Any, float], None]) -> List[bytes]:
+    """
+    Sets the parameters mapped to incoming CC messages to a normalized value
+    and returns the remaining messages.
+    """
+    if not cc_map:
+        return midi
+
+    unmapped = []
+
+    for msg in midi:
+        data = msg.data if type(msg) is TimestampedMidi else msg
+        if len(data) == 3 and data[0] & 0xF0 == 0xB0:
+            params = cc_map.get((data[0] & 0x0F, data[1]))
+            if params is not None:
+                for param in params:
+                    set_value(param, data[2] / 127)
+                continue
+        unmapped.append(msg)
+
+    return unmapped
+
+
+def midi_filter_accepts(table: MidiFilterTable, msg: bytes, size: int = None) -> bool:
+    # size overrides len(msg) for buffers larger than the message
+    if not table.status[msg[0]]:
+        return False
+
+    kind = msg[0] & 0xF0
+
+    if size is None:
+        size = len(msg)
+
+    if kind == 0xB0:
+        return size > 1 and table.controls[msg[1]] == 1
+    elif kind == 0x80 or kind == 0x90 or kind == 0xA0:
+        return size > 1 and table.notes[msg[1]] == 1
+
+    return True
+
+
+class MidiRing:
+    """
+    Fixed capacity single producer, single consumer ring of preallocated MIDI
+    slots for real-time threads. push() copies into a slot and publishes it by
+    advancing the write index, the consumer only advances the read index, so
+    no locks are needed. Messages that do not fit in a slot or arrive while
+    the ring is full are dropped and counted in overflows.
+    """
+
+    def __init__(self, capacity: int = 1024, slot_size: int = 16):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self._mask = capacity - 1
+        self._slot_size = slot_size
+        self._data = bytearray(capacity * slot_size)
+        self._view = memoryview(self._data)
+        self._slot_views = [self._view[i * slot_size:(i + 1) * slot_size] for i in range(capacity)]
+        self._sizes = [0] * capacity
+        self._offsets = [0] * capacity
+        self._write = 0
+        self._read = 0
+        self.overflows = 0
+
+    def push(self, data, offset: int, accept: Callable[[memoryview, int], bool] = None) -> bool:
+        """
+        Producer side. accept(slot, size) sees the whole preallocated slot
+        after the copy and can reject the message before it is published, data
+        needs not be converted to bytes beforehand.
+        """
+        w = self._write
+        size = len(data)
+
+        if w - self._read > self._mask or size > self._slot_size:
+            self.overflows += 1
+            return False
+
+        i = w & self._mask
+        start = i * self._slot_size
+        self._data[start:start + size] = data
+
+        if accept is not None and not accept(self._slot_views[i], size):
+            return False
+
+        self._sizes[i] = size
+        self._offsets[i] = offset
+        self._write = w + 1
+
+        return True
+
+    def drain(self, func: Callable[[memoryview, int], None]) -> int:
+        """
+        Consumer side. Calls func(data, offset) for every pending message, data
+        is a view into the slot that is only valid during the call. Returns the
+        number of messages drained.
+        """
+        r, w = self._read, self._write
+
+        for k in range(r, w):
+            i = k & self._mask
+            start = i * self._slot_size
+            func(self._view[start:start + self._sizes[i]], self._offsets[i])
+
+        self._read = w
+
+        return w - r
+
+
+class WakeupSocket:
+    """
+    threading.Event replacement that can be set from a real-time thread.
+    set() writes one byte to a non-blocking socket pair instead of taking a
+    lock, wait() sleeps in select() and clear() discards pending bytes.
+    """
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def set(self):
+        try:
+            self._writer.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            pass  # buffer full, already set
+
+    def wait(self, timeout: float = None) -> bool:
+        return bool(select.select((self._reader,), (), (), timeout)[0])
+
+    def clear(self):
+        try:
+            while self._reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Callable, Deque, List, Tuple
+
+
+class Priority(IntEnum):
+    HIGH = 0    # listener dispatch
+    NORMAL = 1  # controller work
+    LOW = 2     # background work
+
+
+class Scheduler:
+    """
+    Deferred work queue run once per host tick. Work is run in priority order
+    until the time budget is spent, leftovers carry over to the next tick.
+    Work waiting longer than STARVATION_SEC runs first regardless of priority.
+    At least one item runs per tick so the queue always makes progress.
+    Posting is thread-safe, run() must be called from a single thread.
+    """
+
+    BUDGET_SEC = 0.008
+    STARVATION_SEC = 0.25
+
+    def __init__(self):
+        self._queues: List[Deque[Tuple[float, Callable]]] = [deque() for _ in Priority]
+        self._wakeup: Callable = None
+
+    def post(self, func: Callable, priority: Priority = Priority.NORMAL):
+        self._queues[priority].append((time.monotonic(), func))
+
+    def set_wakeup(self, wakeup: Callable):
+        """
+        Sets a function for backends that only tick on demand, called when
+        work is posted through defer().
+        """
+        self._wakeup = wakeup
+
+    def wakeup(self):
+        if self._wakeup is not None:
+            self._wakeup()
+
+    def pending(self) -> bool:
+        return any(self._queues)
+
+    def run(self, on_error: Callable[[Exception], None]) -> bool:
+        """
+        Runs deferred work and returns True if work is left for the next tick.
+        """
+        now = time.monotonic()
+        deadline = now + Scheduler.BUDGET_SEC
+        overdue = now - Scheduler.STARVATION_SEC
+
+        for queue in self._queues[Priority.NORMAL:]:
+            while queue and queue[0][0] < overdue:
+                Scheduler._call(queue.popleft()[1], on_error)
+                if time.monotonic() >= deadline:
+                    return self.pending()
+
+        while True:
+            for queue in self._queues:
+                if queue:
+                    Scheduler._call(queue.popleft()[1], on_error)
+                    break
+            else:
+                return False
+
+            if time.monotonic() >= deadline:
+                return self.pending()
+
+    @staticmethod
+    def _call(func: Callable, on_error: Callable[[Exception], None]):
+        try:
+            func()
+        except Exception as e:
+            on_error(e)
+
+
+scheduler = Scheduler()
+
+
+def defer(func: Callable, priority: Priority = Priority.NORMAL):
+    scheduler.post(func, priority)
+    scheduler.wakeup()
@@ -7,7 +7,46 @@ from typing import Any
 
 ALL_MIDI_INPUTS = None
 
-Config = namedtuple("Config", ["midi_inputs"])
+Config = namedtuple(
+    "Config",
+    ["midi_inputs", "midi_filter", "idle_tick_rate", "max_tick_rate", "midi_timestamps"],
+    defaults=[None, None, None, False]
+)
+
+# idle_tick_rate is the number of times per second host_callback() is called
+# when there is no MIDI input, listener changes or deferred work. None keeps
+# the host default rate, 0 disables idle calls. max_tick_rate caps how often
+# host_callback() runs when events arrive in bursts, None means no cap.
+# Honored by Bitwig (idle_tick_rate only) and the CLI, Live and REAPER always
+# call host_callback() at UI rate.
+
+# Declarative MIDI input filter, compiled by each backend into the cheapest
+# native form so rejected messages never reach host_callback(). Fields set to
+# None accept everything. Types use mido names, eg. "note_on", "control_change"
+# or "sysex", channels do not apply to system types. Channels are zero-based,
+# controls and notes are any iterable like range().
+
+MidiFilter = namedtuple(
+    "MidiFilter",
+    ["types", "channels", "controls", "notes"],
+    defaults=[None, None, None, None]
+)
+
+# Static "this CC controls this parameter" binding, returned by the optional
+# controller function get_midi_cc_mappings(). Live installs these natively so
+# matching messages never reach Python, other hosts apply them before calling
+# host_callback(). Channel is zero-based.
+
+MidiCCMapping = namedtuple("MidiCCMapping", ["param", "channel", "control"])
+
+# With Config.midi_timestamps set host_callback() receives these instead of
+# bytes. time is the time.monotonic() value when the message arrived at the
+# host. source_time is the backend timestamp, in backend units: JACK frame
+# time on the CLI (frames at 48 kHz since the first tick when replaying a
+# session), Java System.nanoTime() on Bitwig, samples relative to the read
+# time on REAPER, None on Live which provides none.
+
+TimestampedMidi = namedtuple("TimestampedMidi", ["data", "time", "source_time"])
 
 # Handles are not guaranteed to be stable, use host.get_stable_object_id(handle)
 # to identify objects instead.
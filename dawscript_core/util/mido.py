@@ -1,10 +1,12 @@
 # SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
 # SPDX-License-Identifier: MIT
 
-from typing import List
+from typing import Dict, List, Union
 
 from mido import Message
 
+from dawscript_core.host.types import TimestampedMidi
+
 
 def make_cc(*args, **kwargs) -> Message:
     return Message("control_change", *args, **kwargs)
@@ -18,8 +20,130 @@ def make_note_off(*args, **kwargs) -> Message:
     return Message("note_off", *args, **kwargs)
 
 
-def make_midi_messages(midi: List[bytes]) -> List[Message]:
-    return [Message.from_bytes(msg_bytes) for msg_bytes in midi]
+# Channel message type and field names by status high nibble
+_CHANNEL_TYPES = {
+    0x80: ("note_off", ("note", "velocity")),
+    0x90: ("note_on", ("note", "velocity")),
+    0xA0: ("polytouch", ("note", "value")),
+    0xB0: ("control_change", ("control", "value")),
+    0xC0: ("program_change", ("program",)),
+    0xD0: ("aftertouch", ("value",)),
+    0xE0: ("pitchwheel", ()),
+}
+
+# Static decode table indexed by status byte: (type, channel, field -> index)
+_DECODE = [None] * 256
+
+for _kind, (_type, _names) in _CHANNEL_TYPES.items():
+    for _ch in range(16):
+        _DECODE[_kind | _ch] = (_type, _ch, {name: i for i, name in enumerate(_names)})
+
+_FROZEN_CACHE_SIZE = 4096
+
+
+class FrozenMessage(Message):
+    # Same as mido.frozen, which cannot be imported without mido.midifiles
+
+    def __setattr__(self, *_):
+        raise ValueError("frozen message is immutable")
+
+    def __hash__(self):
+        return hash(tuple(sorted(vars(self).items())))
+
+
+_frozen: Dict[bytes, FrozenMessage] = {}
+
+
+class MidiEvent:
+    """
+    Lightweight decoded MIDI message. Channel message fields are read from a
+    static table, anything else, eg. system messages, falls back to a mido
+    message built on first access. Identical bytes share one frozen message,
+    so to_message() results must not be modified and have time 0, the event
+    keeps its own time.
+    """
+
+    __slots__ = ("data", "status", "channel", "data1", "data2", "time")
+
+    def __init__(self, data: bytes, time: float = 0):
+        size = len(data)
+        self.data = data
+        self.status = data[0]
+        self.channel = data[0] & 0x0F if data[0] < 0xF0 else None
+        self.data1 = data[1] if size > 1 else None
+        self.data2 = data[2] if size > 2 else None
+        self.time = time
+
+    @property
+    def type(self) -> str:
+        decoded = _DECODE[self.status]
+        return decoded[0] if decoded is not None else self.to_message().type
+
+    def is_cc(self, control: int = None) -> bool:
+        return self.status & 0xF0 == 0xB0 and (control is None or self.data1 == control)
+
+    def to_message(self) -> FrozenMessage:
+        try:
+            return _frozen[self.data]
+        except KeyError:
+            if len(_frozen) >= _FROZEN_CACHE_SIZE:
+                _frozen.clear()
+            msg = FrozenMessage.from_bytes(self.data)
+            _frozen[self.data] = msg
+            return msg
+
+    def __getattr__(self, name: str):
+        # Only called for names that are not slots or class attributes. copy
+        # and pickle probe dunders on bare instances with no slots set.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            status = object.__getattribute__(self, "status")
+        except AttributeError:
+            raise AttributeError(name) from None
+        decoded = _DECODE[status]
+        if decoded is not None:
+            index = decoded[2].get(name)
+            if index == 0:
+                return self.data1
+            elif index == 1:
+                return self.data2
+            elif name == "pitch" and status & 0xF0 == 0xE0:
+                return (self.data2 << 7 | self.data1) - 8192
+        return getattr(self.to_message(), name)
+
+    def __eq__(self, other) -> bool:
+        # Like mido, time is included in the comparison
+        if isinstance(other, MidiEvent):
+            return self.data == other.data and self.time == other.time
+        if isinstance(other, Message):
+            return self.data == bytes(other.bytes()) and self.time == other.time
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.data, self.time))
+
+    def __repr__(self) -> str:
+        return f"MidiEvent({self.data.hex(' ')}, time={self.time})"
+
+
+def make_midi_event(msg: Union[bytes, TimestampedMidi]) -> MidiEvent:
+    # Timestamps end up in MidiEvent.time
+    if type(msg) is TimestampedMidi:
+        return MidiEvent(msg.data, msg.time)
+    return MidiEvent(msg)
+
+
+def make_midi_messages(midi: List[Union[bytes, TimestampedMidi]]) -> List[Message]:
+    # Timestamps end up in Message.time
+    return [Message.from_bytes(msg.data, time=msg.time) if type(msg) is TimestampedMidi
+            else Message.from_bytes(msg) for msg in midi]
+
+
+def make_midi_events(midi: List[Union[bytes, TimestampedMidi]]) -> List[MidiEvent]:
+    # Cheaper than make_midi_messages(), MidiEvent reads like a mido Message
+    # and compares equal to one, use to_message() for a real one
+    return [make_midi_event(msg) for msg in midi]
 
 
 def is_note_on_or_note_off(msg: Message) -> bool:
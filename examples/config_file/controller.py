@@ -6,6 +6,7 @@ from typing import List
 from dawscript_core.host import Config
 from dawscript_core.util import dawscript_path
 from dawscript_core.extra.config_file import parse_config_file
+from dawscript_core.extra.gadget import GadgetHub
 
 # from example_functions import pressed_twice_callback
 
@@ -14,11 +15,12 @@ config, gadgets = parse_config_file(
     globals()
 )
 
+hub = GadgetHub(gadgets)
+
 
 def get_config() -> Config:
     return config
 
 
 def host_callback(midi: List[bytes]):
-    for gadget in gadgets:
-        gadget.process(midi)
+    hub.process(midi)
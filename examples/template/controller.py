@@ -3,13 +3,17 @@
 
 from typing import List
 
-from dawscript_core.host import ALL_MIDI_INPUTS, Config
+from dawscript_core.host import ALL_MIDI_INPUTS, Config, MidiCCMapping
 
 
 def get_config() -> Config:
     return Config(midi_inputs=ALL_MIDI_INPUTS)
 
 
+def get_midi_cc_mappings() -> List[MidiCCMapping]:
+    return []
+
+
 def on_script_start():
     pass
 
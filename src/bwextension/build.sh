@@ -57,7 +57,8 @@ java_files=(
   Controller.java
   DawscriptExtension.java
   DawscriptExtensionDefinition.java
-  PythonRunnable.java
+  PackedWriter.java
+  ParameterRangeCache.java
   PythonScript.java
 )
 
@@ -3,7 +3,6 @@
 
 package dawscript;
 
-import java.util.List;
 import java.util.Map;
 
 public interface Controller
@@ -16,5 +15,7 @@ public interface Controller
 
     void on_project_load();
 
-    void host_callback(List<byte[]> midi);
+    void host_callback(byte[] midi);
+
+    void update_mirror(byte[] changes);
 }
@@ -3,16 +3,20 @@
 
 package dawscript;
 
+import java.io.ByteArrayOutputStream;
 import java.io.File;
+import java.io.IOException;
 import java.net.InetAddress;
-import java.util.ArrayList;
 import java.util.HashMap;
 import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.Map;
 import java.util.Queue;
 import java.util.Random;
-import java.util.Timer;
-import java.util.TimerTask;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
 import java.util.concurrent.ConcurrentLinkedQueue;
+import java.util.concurrent.atomic.AtomicBoolean;
 
 import com.bitwig.extension.api.util.midi.ShortMidiMessage;
 import com.bitwig.extension.callback.ShortMidiMessageReceivedCallback;
@@ -20,6 +24,7 @@ import com.bitwig.extension.controller.ControllerExtension;
 import com.bitwig.extension.controller.ControllerExtensionDefinition;
 import com.bitwig.extension.controller.api.Application;
 import com.bitwig.extension.controller.api.ControllerHost;
+import com.bitwig.extension.controller.api.CursorRemoteControlsPage;
 import com.bitwig.extension.controller.api.Device;
 import com.bitwig.extension.controller.api.DeviceBank;
 import com.bitwig.extension.controller.api.Parameter;
@@ -36,7 +41,24 @@ import py4j.reflection.RootClassLoadingStrategy;
 
 public class DawscriptExtension extends ControllerExtension
 {
-   public record Listener(long identifier, PythonRunnable runnable) {}
+   public record Change(int objectId, int prop, Object value) {}
+   public record MidiEvent(ShortMidiMessage message, long time) {}
+
+   // Property codes and value tags, see bitwig.py
+   private static final int PROP_NAME = 0;
+   private static final int PROP_TYPE = 1;
+   private static final int PROP_MUTE = 2;
+   private static final int PROP_VOLUME = 3;
+   private static final int PROP_PAN = 4;
+   private static final int PROP_ENABLED = 5;
+   private static final int PROP_VALUE = 6;
+   private static final int PROP_DISPLAY_VALUE = 7;
+
+   private static final int VALUE_BOOLEAN = 0;
+   private static final int VALUE_DOUBLE = 1;
+   private static final int VALUE_STRING = 2;
+
+   private static final int ENABLED_UNKNOWN = 2;
 
    private static final boolean ENABLE_PARAMETER_RANGES_HACK = false;
 
@@ -45,22 +67,48 @@ public class DawscriptExtension extends ControllerExtension
    private static final int MAX_PARAMETERS = 32;
 
    private static final long HOST_CALLBACK_MS = 16;
+   private static final long PYTHON_CONNECT_TIMEOUT_MS = 3000;
+   private static final long PYTHON_CONTROLLER_TIMEOUT_MS = 15000;
+   private static final int MIDI_BUFFER_SIZE = 3 * 32;
 
-   private final Queue<PythonRunnable> deferred;
-   private final Queue<ShortMidiMessage> midiQueue;
-   private final HashMap<String,ArrayList<Listener>> listeners;
+   private final Queue<MidiEvent> midiQueue;
+   private final Set<Object> mirrored;
+   private LinkedHashMap<Long,Change> changes;
    private final HashMap<Track,DeviceBank> deviceBanks;
-   private final HashMap<Device,ParameterBank> parameterBanks;
-   private HashMap<Parameter, double[]> parameterRanges;
+   private final HashMap<Device,CursorRemoteControlsPage> parameterBanks;
+   private final int[] deviceWindowPositions;
+   private int trackWindowPosition;
+   private final HashMap<Parameter,Device> parameterDevices;
+   private final Queue<Parameter> probeQueue;
+   private final AtomicBoolean probeActive;
+   private final double[] probeRange;
+   private ParameterRangeCache parameterRangeCache;
+   private volatile boolean probeStopped;
+   private Parameter probeParameter;
+   private String probeDeviceName;
+   private String probeParameterName;
+   private double probeInitValue;
+   private boolean probeAwaitingValue;
+   private int probeWaitSteps;
+   private int probeStepIndex;
+   private boolean probeMutedMaster;
    private SettableBooleanValue masterTrackMute;
    private TrackBank trackBank;
    private GatewayServer gatewayServer;
    private PythonScript pythonScript;
-   private Timer hostCallbackTimer;
+   private Thread hostCallbackThread;
+   private final Object hostCallbackLock = new Object();
+   private boolean hostCallbackRequested;
+   private volatile boolean eventDriven;
+   private volatile long idleTickMs;
    private String projectName;
    private Controller controller;
-   private int pythonScriptWaitTime;
-   private int unmuteMasterTrackWaitTime;
+   private byte[] midiFilterStatus;
+   private byte[] midiFilterControls;
+   private byte[] midiFilterNotes;
+   private volatile boolean midiTimestamps;
+   private long pythonScriptStartTime;
+   private volatile boolean pythonScriptReady;
 
    // https://stackoverflow.com/questions/53288375/py4j-callback-interface-throws-invalid-interface-name-when-the-packaged-jar-i
    // https://github.com/py4j/py4j/issues/339#issuecomment-473655738
@@ -78,12 +126,16 @@ public class DawscriptExtension extends ControllerExtension
    {
       super(definition, host);
 
-      deferred = new ConcurrentLinkedQueue<>();
       midiQueue = new ConcurrentLinkedQueue<>();
-      listeners = new HashMap<>();
+      mirrored = ConcurrentHashMap.newKeySet();
+      changes = new LinkedHashMap<>();
       deviceBanks = new HashMap<>();
       parameterBanks = new HashMap<>();
-      parameterRanges = new HashMap<>();
+      deviceWindowPositions = new int[MAX_TRACKS];
+      parameterDevices = new HashMap<>();
+      probeQueue = new ConcurrentLinkedQueue<>();
+      probeActive = new AtomicBoolean();
+      probeRange = new double[2];
    }
 
    @Override
@@ -105,7 +157,7 @@ public class DawscriptExtension extends ControllerExtension
             .build();
          gatewayServer.start();
 
-         pythonScriptWaitTime = 1;
+         pythonScriptStartTime = System.nanoTime();
          pythonScript = new PythonScript(host::println, host::errorln);
          final File script = BitwigExtensionLocator.getPath(filename + ".bwextension")
             .toPath()
@@ -115,6 +167,13 @@ public class DawscriptExtension extends ControllerExtension
             .toFile();
          pythonScript.start(script, Integer.toString(gatewayServer.getPort()));
 
+         parameterRangeCache = new ParameterRangeCache(ParameterRangeCache.getDefaultFile());
+         try {
+            parameterRangeCache.load();
+         } catch (IOException e) {
+            e.printStackTrace();
+         }
+
          markInterested();
 
          final Application app = host.createApplication();
@@ -132,13 +191,9 @@ public class DawscriptExtension extends ControllerExtension
             }
          });
 
-         hostCallbackTimer = new Timer();
-         hostCallbackTimer.scheduleAtFixedRate(new TimerTask() {
-             @Override
-             public void run() {
-                 hostCallback();
-             }
-         }, 0, HOST_CALLBACK_MS);
+         hostCallbackThread = new Thread(this::runHostCallbackLoop, "dawscript-host-callback");
+         hostCallbackThread.setDaemon(true);
+         hostCallbackThread.start();
       } catch (Exception e) {
          host.showPopupNotification(e.getMessage());
       }
@@ -147,9 +202,14 @@ public class DawscriptExtension extends ControllerExtension
    @Override
    public void exit()
    {
-      if (hostCallbackTimer != null) {
-         hostCallbackTimer.cancel();
-         hostCallbackTimer = null;
+      if (hostCallbackThread != null) {
+         hostCallbackThread.interrupt();
+         try {
+            hostCallbackThread.join();
+         } catch (InterruptedException e) {
+            e.printStackTrace();
+         }
+         hostCallbackThread = null;
       }
 
       if (controller != null) {
@@ -161,6 +221,27 @@ public class DawscriptExtension extends ControllerExtension
          controller = null;
       }
 
+      probeStopped = true;
+      probeQueue.clear();
+
+      // Undo a probe interrupted between muting and restoring
+      if (probeStepIndex == 3 || probeStepIndex == 4) {
+         probeParameter.setImmediately(probeInitValue);
+      }
+
+      if (probeMutedMaster) {
+         probeMutedMaster = false;
+         masterTrackMute.set(false);
+      }
+
+      if (parameterRangeCache != null) {
+         try {
+            parameterRangeCache.save();
+         } catch (IOException e) {
+            e.printStackTrace();
+         }
+      }
+
       if (pythonScript != null) {
          pythonScript.stop();
          pythonScript = null;
@@ -178,10 +259,35 @@ public class DawscriptExtension extends ControllerExtension
       // Empty
    }
 
+   // Called by bitwig.py as soon as the gateway connects, before the
+   // controller module is imported
+   public void notifyPythonReady()
+   {
+      pythonScriptReady = true;
+   }
+
    public void setController(Controller controller)
    {
       this.controller = controller;
 
+      try {
+         final Map<String,Object> config = controller.get_config();
+         midiFilterStatus = (byte[]) config.get("midi_filter_status");
+         midiFilterControls = (byte[]) config.get("midi_filter_controls");
+         midiFilterNotes = (byte[]) config.get("midi_filter_notes");
+         midiTimestamps = Boolean.TRUE.equals(config.get("midi_timestamps"));
+
+         // Without an idle tick rate Python is called at a fixed rate
+         final Number idleTickRate = (Number) config.get("idle_tick_rate");
+         if (idleTickRate != null) {
+            final double rate = idleTickRate.doubleValue();
+            idleTickMs = rate > 0 ? Math.max(1, Math.round(1000.0 / rate)) : -1;
+            eventDriven = true;
+         }
+      } catch (Exception e) {
+         e.printStackTrace();
+      }
+
       try {
          controller.on_script_start();
       } catch (Exception e) {
@@ -197,49 +303,103 @@ public class DawscriptExtension extends ControllerExtension
       for (int i = 0; i < getExtensionDefinition().getNumMidiInPorts(); i++) {
          final int portIndex = i;
          getMidiInPort(portIndex).setMidiCallback((ShortMidiMessageReceivedCallback) msg -> {
-             midiQueue.add(msg);
+            if (acceptMidi(msg)) {
+               midiQueue.add(new MidiEvent(msg, midiTimestamps ? System.nanoTime() : 0));
+               requestHostCallback();
+            }
          });
       }
    }
 
-   public void addListener(Object target, String prop, long identifier, PythonRunnable runnable)
+   // Wakes the host callback thread in event driven mode when there is MIDI or
+   // value changes. Python runs deferred work on its own dispatcher thread.
+   private void requestHostCallback()
    {
-      final String key = keyTargetProp(target, prop);
-      ArrayList<Listener> listenerList = listeners.get(key);
-
-      if (listenerList == null) {
-         listenerList = new ArrayList<>();
-         listeners.put(key, listenerList);
+      if (eventDriven) {
+         synchronized (hostCallbackLock) {
+            hostCallbackRequested = true;
+            hostCallbackLock.notify();
+         }
       }
+   }
 
-      listenerList.add(new Listener(identifier, runnable));
+   public TrackBank getTrackBank()
+   {
+      return trackBank;
    }
 
-   public void removeListener(Object target, String prop, long identifier)
+   // The track bank is a window of MAX_TRACKS slots that can be scrolled over
+   // the whole project, slot objects then refer to different tracks. Device
+   // banks scroll the same way per track slot, parameters by remote controls
+   // page. Bitwig applies scroll positions asynchronously, so the requested
+   // positions are kept here rather than read back from the banks.
+   public int getTrackWindowPosition()
    {
-      final String key = keyTargetProp(target, prop);
-      final ArrayList<Listener> listenerList = listeners.get(key);
+      return trackWindowPosition;
+   }
 
-      if (listenerList == null) {
-         return;
-      }
+   public int getTrackWindowSize()
+   {
+      final int remaining = trackBank.itemCount().get() - trackWindowPosition;
+      return Math.max(0, Math.min(remaining, MAX_TRACKS));
+   }
 
-      final Iterator<Listener> iterator = listenerList.iterator();
-      while (iterator.hasNext()) {
-          final Listener someListener = iterator.next();
-          if (someListener.identifier == identifier) {
-              iterator.remove();
-          }
-      }
+   public int getTrackCount()
+   {
+      return trackBank.itemCount().get();
+   }
 
-      if (listenerList.isEmpty()) {
-         listeners.remove(key);
-      }
+   public void setTrackWindowPosition(int position)
+   {
+      trackWindowPosition = Math.max(0, position);
+      trackBank.scrollPosition().set(trackWindowPosition);
    }
 
-   public TrackBank getTrackBank()
+   public int getDeviceCount(int track)
    {
-      return trackBank;
+      return deviceBanks.get(trackBank.getItemAt(track)).itemCount().get();
+   }
+
+   public int getDeviceWindowSize(int track)
+   {
+      final int remaining = getDeviceCount(track) - deviceWindowPositions[track];
+      return Math.max(0, Math.min(remaining, MAX_DEVICES));
+   }
+
+   public void setDeviceWindowPosition(int track, int position)
+   {
+      deviceWindowPositions[track] = Math.max(0, position);
+      deviceBanks.get(trackBank.getItemAt(track)).scrollPosition().set(deviceWindowPositions[track]);
+   }
+
+   public int getParameterPageCount(int track, int device)
+   {
+      return parameterBanks.get(getDeviceSlot(track, device)).pageCount().get();
+   }
+
+   public void setParameterPage(int track, int device, int page)
+   {
+      parameterBanks.get(getDeviceSlot(track, device)).selectedPageIndex().set(Math.max(0, page));
+   }
+
+   // Device and parameter observers must be created in init() but stay
+   // unsubscribed until Python touches the object, so Bitwig does not send
+   // notifications for values nobody reads. Values arrive asynchronously,
+   // listeners fire once they do. From then on value changes are pushed to
+   // the Python mirror. Returns the stable object id used as mirror key.
+   public int subscribe(Object target)
+   {
+      mirrored.add(target);
+
+      if (target instanceof Parameter) {
+         final Parameter param = (Parameter) target;
+         param.value().subscribe();
+         param.displayedValue().subscribe();
+      } else if (target instanceof Device) {
+         ((Device) target).isEnabled().subscribe();
+      }
+
+      return getStableObjectId(target);
    }
 
    public DeviceBank getTrackDeviceBank(Track track)
@@ -252,44 +412,257 @@ public class DawscriptExtension extends ControllerExtension
       return parameterBanks.get(plugin);
    }
 
+   // Bank slots are fixed objects created in init(), Python fetches each slot
+   // once and caches it by index
+   public Track getTrackSlot(int track)
+   {
+      return trackBank.getItemAt(track);
+   }
+
+   public Device getDeviceSlot(int track, int device)
+   {
+      return deviceBanks.get(trackBank.getItemAt(track)).getDevice(device);
+   }
+
+   public Parameter getParameterSlot(int track, int device, int parameter)
+   {
+      return parameterBanks.get(getDeviceSlot(track, device)).getParameter(parameter);
+   }
+
+   // Bank position of a track or device handle that did not come from the
+   // slot getters above, eg. a restored handle. Null if it is in no bank.
+   public int[] getSlotKey(Object target)
+   {
+      for (int i = 0; i < MAX_TRACKS; i++) {
+         final Track track = trackBank.getItemAt(i);
+
+         if (target.equals(track)) {
+            return new int[] { i };
+         }
+
+         if (target instanceof Device) {
+            final DeviceBank deviceBank = deviceBanks.get(track);
+            for (int j = 0; j < MAX_DEVICES; j++) {
+               if (target.equals(deviceBank.getDevice(j))) {
+                  return new int[] { i, j };
+               }
+            }
+         }
+      }
+
+      return null;
+   }
+
+   // Which slots hold existing items: track count, then per track the device
+   // count, then per device a bitmask of parameters that have a name
+   public byte[] getProjectLayout()
+   {
+      final PackedWriter writer = new PackedWriter();
+      final int trackCount = getTrackWindowSize();
+
+      writer.writeInt(trackCount);
+
+      for (int i = 0; i < trackCount; i++) {
+         final DeviceBank deviceBank = deviceBanks.get(trackBank.getItemAt(i));
+         final int deviceCount = getDeviceWindowSize(i);
+
+         writer.writeInt(deviceCount);
+
+         for (int j = 0; j < deviceCount; j++) {
+            final ParameterBank parameterBank = parameterBanks.get(deviceBank.getDevice(j));
+            int mask = 0;
+
+            for (int k = 0; k < MAX_PARAMETERS; k++) {
+               if (! parameterBank.getParameter(k).name().get().isEmpty()) {
+                  mask |= 1 << k;
+               }
+            }
+
+            writer.writeInt(mask);
+         }
+      }
+
+      return writer.toByteArray();
+   }
+
    public double[] getParameterRange(Parameter param)
    {
-      return parameterRanges.containsKey(param)
-         ? parameterRanges.get(param)
-         : new double[] { 0.0, 1.0 };
+      final Device device = parameterDevices.get(param);
+      final double[] range = device != null
+         ? parameterRangeCache.get(device.name().get(), param.name().get())
+         : null;
+
+      return range != null ? range : new double[] { 0.0, 1.0 };
+   }
+
+   // Visible mixer state packed in a single byte[], decoded by bitwig.py
+   public byte[] getMixerSnapshot()
+   {
+      final PackedWriter writer = new PackedWriter();
+      final int trackCount = getTrackWindowSize();
+
+      writer.writeInt(trackCount);
+
+      for (int i = 0; i < trackCount; i++) {
+         final Track track = trackBank.getItemAt(i);
+         final String trackType = track.trackType().get();
+
+         writer.writeInt(i)
+            .writeInt(getStableObjectId(track))
+            .writeString(track.name().get())
+            .writeByte("Audio".equals(trackType) ? 0 : "Instrument".equals(trackType) ? 1 : 2)
+            .writeBoolean(track.mute().get())
+            .writeDouble(track.volume().get())
+            .writeDouble(track.pan().get());
+
+         final DeviceBank deviceBank = deviceBanks.get(track);
+         final int deviceCount = getDeviceWindowSize(i);
+
+         writer.writeInt(deviceCount);
+
+         for (int j = 0; j < deviceCount; j++) {
+            final Device device = deviceBank.getDevice(j);
+            // Enabled state is unknown until Python subscribes the device
+            writer.writeString(device.name().get())
+               .writeByte(! device.isEnabled().isSubscribed() ? ENABLED_UNKNOWN
+                  : device.isEnabled().get() ? 1 : 0);
+         }
+      }
+
+      return writer.toByteArray();
    }
 
    // TODO: The Bitwig Java API appears to be asynchronous, so rapid, repeated
-   // changes to the same parameter may not be reflected. The delay value below
+   // changes to the same parameter may not be reflected. The step delay below
    // works in most cases but should not be hardcoded. Consider tying it to a
    // dynamic value, such as the audio buffer size or some UI update interval.
-   public static void callEngineAndWait(Runnable r)
+   private static final long PROBE_STEP_MS = 25;
+   private static final long PROBE_UNMUTE_MS = 250;
+   private static final long PROBE_VALUE_TIMEOUT_MS = 1000;
+
+   // Probing runs one step per scheduled host task, never blocking the host
+   // callback. Results are persisted by ParameterRangeCache.
+   private void queueParameterRangeProbe(Parameter param)
    {
-      try {
-         r.run();
-         Thread.sleep(25);
-      } catch (Exception e) {}
+      probeQueue.add(param);
+
+      if (probeActive.compareAndSet(false, true)) {
+         getHost().scheduleTask(this::probeStep, 0);
+      }
    }
 
-   private void probeParameterRange(Parameter param)
+   private void probeStep()
    {
-      final double[] range = new double[2];
-      final double initValue = param.get();
+      if (probeStopped) {
+         return;
+      }
+
+      try {
+         switch (probeStepIndex) {
+            case 0:
+               probeParameter = probeQueue.poll();
+
+               if (probeParameter == null) {
+                  finishProbing();
+                  return;
+               }
+
+               probeDeviceName = parameterDevices.get(probeParameter).name().get();
+               probeParameterName = probeParameter.name().get();
+
+               if (parameterRangeCache.contains(probeDeviceName, probeParameterName)) {
+                  getHost().scheduleTask(this::probeStep, 0);
+                  return;
+               }
+
+               // A freshly subscribed value is only valid once Bitwig
+               // delivers it, see onProbeParameterValue()
+               if (probeParameter.value().isSubscribed()) {
+                  probeInitValue = probeParameter.get();
+                  probeAwaitingValue = false;
+               } else {
+                  probeAwaitingValue = true;
+                  probeWaitSteps = 0;
+                  subscribe(probeParameter);
+               }
+               break;
+            case 1:
+               if (probeAwaitingValue) {
+                  if (++probeWaitSteps * PROBE_STEP_MS < PROBE_VALUE_TIMEOUT_MS) {
+                     getHost().scheduleTask(this::probeStep, PROBE_STEP_MS);
+                     return;
+                  }
+                  // Never arrived, leave the parameter untouched
+                  probeAwaitingValue = false;
+                  probeStepIndex = 0;
+                  getHost().scheduleTask(this::probeStep, 0);
+                  return;
+               }
 
-      if (unmuteMasterTrackWaitTime > 0 || ! masterTrackMute.get()) {
-         callEngineAndWait(() -> masterTrackMute.set(true));
-         unmuteMasterTrackWaitTime = 1;
+               if (! masterTrackMute.get()) {
+                  masterTrackMute.set(true);
+                  probeMutedMaster = true;
+               }
+               break;
+            case 2:
+               probeParameter.setImmediately(0.0);
+               break;
+            case 3:
+               probeRange[0] = probeParameter.getRaw();
+               probeParameter.setImmediately(1.0);
+               break;
+            case 4:
+               probeRange[1] = probeParameter.getRaw();
+               probeParameter.setImmediately(probeInitValue);
+               break;
+            case 5:
+               parameterRangeCache.put(probeDeviceName, probeParameterName, probeRange.clone());
+               pushChange(probeParameter, PROP_VALUE, probeParameter.get());
+               break;
+         }
+
+         probeStepIndex = (probeStepIndex + 1) % 6;
+      } catch (Exception e) {
+         e.printStackTrace();
+         probeAwaitingValue = false;
+         probeStepIndex = 0;
       }
 
-      callEngineAndWait(() -> param.setImmediately(0.0));
-      range[0] = param.getRaw();
-      callEngineAndWait(() -> param.setImmediately(1.0));
-      range[1] = param.getRaw();
+      getHost().scheduleTask(this::probeStep, PROBE_STEP_MS);
+   }
+
+   private void onProbeParameterValue(Parameter param, double value)
+   {
+      if (probeAwaitingValue && param == probeParameter) {
+         probeInitValue = value;
+         probeAwaitingValue = false;
+      }
+   }
+
+   private void finishProbing()
+   {
+      probeActive.set(false);
 
-      callEngineAndWait(() -> param.setImmediately(initValue));
-      callListeners(param, "value");
+      // Parameter queued after poll() returned null
+      if (! probeQueue.isEmpty() && probeActive.compareAndSet(false, true)) {
+         getHost().scheduleTask(this::probeStep, 0);
+         return;
+      }
 
-      parameterRanges.put(param, range);
+      if (probeMutedMaster) {
+         getHost().scheduleTask(() -> {
+            if (! probeActive.get() && probeMutedMaster) {
+               probeMutedMaster = false;
+               masterTrackMute.set(false);
+            }
+         }, PROBE_UNMUTE_MS);
+      }
+
+      try {
+         parameterRangeCache.save();
+      } catch (IOException e) {
+         e.printStackTrace();
+      }
    }
 
    @SuppressWarnings("unused")
@@ -300,6 +673,7 @@ public class DawscriptExtension extends ControllerExtension
 
       trackBank = getHost().getProject().getRootTrackGroup()
          .createMainTrackBank(MAX_TRACKS, 0, 0, true);
+      trackBank.scrollPosition().markInterested();
 
       trackBank.itemCount().addValueObserver(arg -> {
          if (controller != null) {
@@ -313,41 +687,47 @@ public class DawscriptExtension extends ControllerExtension
 
       for (int i = 0; i < MAX_TRACKS; i++) {
          final Track track = trackBank.getItemAt(i);
-         track.trackType().markInterested();
-         track.name().markInterested();
-         track.mute().addValueObserver(arg -> callListeners(track, "mute"));
-         track.volume().value().addValueObserver(arg -> callListeners(track, "volume"));
-         track.pan().value().addValueObserver(arg -> callListeners(track, "pan"));
+         track.trackType().addValueObserver(arg -> pushChange(track, PROP_TYPE, arg));
+         track.name().addValueObserver(arg -> pushChange(track, PROP_NAME, arg));
+         track.mute().addValueObserver(arg -> pushChange(track, PROP_MUTE, arg));
+         track.volume().value().addValueObserver(arg -> pushChange(track, PROP_VOLUME, arg));
+         track.pan().value().addValueObserver(arg -> pushChange(track, PROP_PAN, arg));
 
          final DeviceBank deviceBank = track.createDeviceBank(MAX_DEVICES);
          deviceBank.itemCount().markInterested();
+         deviceBank.scrollPosition().markInterested();
          deviceBanks.put(track, deviceBank);
 
          for (int j = 0; j < MAX_DEVICES; j++) {
             final Device device = deviceBank.getDevice(j);
             device.isPlugin().markInterested();
-            device.name().markInterested();
-            device.isEnabled().addValueObserver(arg -> callListeners(device, "enabled"));
+            device.name().addValueObserver(arg -> pushChange(device, PROP_NAME, arg));
+            device.isEnabled().addValueObserver(arg -> pushChange(device, PROP_ENABLED, arg));
+            device.isEnabled().unsubscribe();
 
-            final ParameterBank parameterBank = device.createCursorRemoteControlsPage(MAX_PARAMETERS);
+            final CursorRemoteControlsPage parameterBank = device.createCursorRemoteControlsPage(MAX_PARAMETERS);
+            parameterBank.pageCount().markInterested();
+            parameterBank.selectedPageIndex().markInterested();
             parameterBanks.put(device, parameterBank);
 
             for (int k = 0; k < MAX_PARAMETERS; k++) {
                final Parameter parameter = parameterBank.getParameter(k);
-               parameter.name().markInterested();
+               parameterDevices.put(parameter, device);
+               parameter.name().addValueObserver(arg -> pushChange(parameter, PROP_NAME, arg));
                parameter.value().addValueObserver(arg -> {
-                  callListeners(parameter, "value");
+                  onProbeParameterValue(parameter, arg);
+                  pushChange(parameter, PROP_VALUE, arg);
                });
                parameter.displayedValue().addValueObserver(arg -> {
-                  callListeners(parameter, "dpy_value");
+                  pushChange(parameter, PROP_DISPLAY_VALUE, arg);
                });
+               parameter.value().unsubscribe();
+               parameter.displayedValue().unsubscribe();
                if (ENABLE_PARAMETER_RANGES_HACK) {
                   parameter.exists().addValueObserver(arg -> {
-                     deferred.add(() -> {
-                        if (arg) {
-                           probeParameterRange(parameter);
-                        }
-                     });
+                     if (arg) {
+                        queueParameterRangeProbe(parameter);
+                     }
                   });
                }
             }
@@ -355,24 +735,139 @@ public class DawscriptExtension extends ControllerExtension
       }
    }
 
-   private void callListeners(Object target, String prop)
+   // Rejected messages are dropped before crossing the bridge to Python
+   private boolean acceptMidi(ShortMidiMessage msg)
    {
-      final String key = keyTargetProp(target, prop);
-      final ArrayList<Listener> listenerList = listeners.get(key);
+      if (midiFilterStatus == null) {
+         return true;
+      }
+
+      final int status = msg.getStatusByte();
+
+      if (midiFilterStatus[status] == 0) {
+         return false;
+      }
+
+      switch (status & 0xF0) {
+         case 0xB0:
+            return midiFilterControls[msg.getData1()] != 0;
+         case 0x80:
+         case 0x90:
+         case 0xA0:
+            return midiFilterNotes[msg.getData1()] != 0;
+         default:
+            return true;
+      }
+   }
+
+   // Changes are coalesced per object and property until the next host
+   // callback, only the latest value is pushed to Python
+   private void pushChange(Object target, int prop, Object value)
+   {
+      if (! mirrored.contains(target)) {
+         return;
+      }
 
-      if (listenerList != null) {
-         for (final Listener listener : listenerList) {
-            deferred.add(listener.runnable);
+      final int objectId = getStableObjectId(target);
+
+      synchronized (mirrored) {
+         changes.put(((long) objectId << 8) | prop, new Change(objectId, prop, value));
+      }
+
+      requestHostCallback();
+   }
+
+   // Packs (object id, property, value) for all pending changes
+   private byte[] packChanges()
+   {
+      final LinkedHashMap<Long,Change> pending;
+
+      synchronized (mirrored) {
+         if (changes.isEmpty()) {
+            return null;
+         }
+
+         pending = changes;
+         changes = new LinkedHashMap<>();
+      }
+
+      final PackedWriter writer = new PackedWriter();
+
+      for (final Change change : pending.values()) {
+         final Object value = change.value();
+
+         writer.writeInt(change.objectId()).writeByte(change.prop());
+
+         if (value instanceof Boolean) {
+            writer.writeByte(VALUE_BOOLEAN).writeBoolean((Boolean) value);
+         } else if (value instanceof Number) {
+            writer.writeByte(VALUE_DOUBLE).writeDouble(((Number) value).doubleValue());
+         } else {
+            writer.writeByte(VALUE_STRING).writeString(String.valueOf(value));
+         }
+      }
+
+      return writer.toByteArray();
+   }
+
+   private void runHostCallbackLoop()
+   {
+      try {
+         while (! Thread.currentThread().isInterrupted()) {
+            waitForHostCallback();
+            try {
+               hostCallback();
+            } catch (Exception e) {
+               e.printStackTrace();
+            }
+         }
+      } catch (InterruptedException e) {
+         // exit()
+      }
+   }
+
+   private void waitForHostCallback() throws InterruptedException
+   {
+      synchronized (hostCallbackLock) {
+         final long period = hostCallbackPeriod();
+         final long deadline = System.currentTimeMillis() + period;
+
+         while (! hostCallbackRequested) {
+            if (period < 0) {
+               hostCallbackLock.wait();
+               continue;
+            }
+
+            final long remaining = deadline - System.currentTimeMillis();
+
+            if (remaining <= 0) {
+               break;
+            }
+
+            hostCallbackLock.wait(remaining);
          }
+
+         hostCallbackRequested = false;
       }
    }
 
+   // Milliseconds until the next callback when idle, -1 to wait for events
+   private long hostCallbackPeriod()
+   {
+      if (! eventDriven || controller == null) {
+         return HOST_CALLBACK_MS;
+      }
+
+      return idleTickMs;
+   }
+
    private void hostCallback()
    {
       if (controller == null) {
-         if (pythonScriptWaitTime > 0) {
-            if (pythonScriptWaitTime++ == 100) {
-               pythonScriptWaitTime = 0;
+         if (pythonScriptStartTime > 0) {
+            final long elapsedMs = (System.nanoTime() - pythonScriptStartTime) / 1000000;
+            if (elapsedMs > (pythonScriptReady ? PYTHON_CONTROLLER_TIMEOUT_MS : PYTHON_CONNECT_TIMEOUT_MS)) {
+               pythonScriptStartTime = 0;
                getHost().showPopupNotification("Python script timeout, check Bitwig log file for errors."); 
             }
          }
@@ -380,30 +875,42 @@ public class DawscriptExtension extends ControllerExtension
          return;
       }
 
-      if (unmuteMasterTrackWaitTime > 0) {
-         if (unmuteMasterTrackWaitTime++ == 10) {
-            unmuteMasterTrackWaitTime = 0;
-            masterTrackMute.set(false);
-         }
-      }
-   
-      if (! deferred.isEmpty()) {
-         PythonRunnable runnable;
-         while ((runnable = deferred.poll()) != null) {
-            runnable.run();
+      final byte[] packedChanges = packChanges();
+
+      if (packedChanges != null) {
+         try {
+            controller.update_mirror(packedChanges);
+         } catch (Exception e) {
+            e.printStackTrace();
          }
       }
 
-      final ArrayList<byte[]> messages = new ArrayList<>();
+      // Contiguous 3-byte messages, null when there is nothing to deliver.
+      // With timestamps: send time (q), then per message 3 bytes and arrival
+      // time (q), both System.nanoTime().
+      byte[] messages = null;
 
       if (! midiQueue.isEmpty()) {
-         ShortMidiMessage msg;
-         while ((msg = midiQueue.poll()) != null) {
-            messages.add(new byte[] {
-               (byte) msg.getStatusByte(),
-               (byte) msg.getData1(),
-               (byte) msg.getData2()
-            });
+         MidiEvent event;
+         if (midiTimestamps) {
+            final PackedWriter writer = new PackedWriter().writeLong(System.nanoTime());
+            while ((event = midiQueue.poll()) != null) {
+               final ShortMidiMessage msg = event.message();
+               writer.writeByte(msg.getStatusByte())
+                  .writeByte(msg.getData1())
+                  .writeByte(msg.getData2())
+                  .writeLong(event.time());
+            }
+            messages = writer.toByteArray();
+         } else {
+            final ByteArrayOutputStream buffer = new ByteArrayOutputStream(MIDI_BUFFER_SIZE);
+            while ((event = midiQueue.poll()) != null) {
+               final ShortMidiMessage msg = event.message();
+               buffer.write(msg.getStatusByte());
+               buffer.write(msg.getData1());
+               buffer.write(msg.getData2());
+            }
+            messages = buffer.toByteArray();
          }
       }
 
@@ -414,13 +921,6 @@ public class DawscriptExtension extends ControllerExtension
       }
    }
 
-   private static String keyTargetProp(Object target, String prop)
-   {
-      return target.getClass().getSimpleName()
-               + "@" + Integer.toHexString(getStableObjectId(target))
-               + "_" + prop;
-   }
-
    private static String pascalToSnake(String input) {
       if (input == null || input.isEmpty()) {
          return input;
@@ -0,0 +1,91 @@
+// SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+// SPDX-License-Identifier: MIT
+
+package dawscript;
+
+import java.io.ByteArrayOutputStream;
+import java.io.DataOutputStream;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+
+// Big-endian binary writer for data sent to Python as a single byte[], which
+// py4j transfers in one piece instead of one round trip per element.
+// Decoded in bitwig.py using struct format characters noted below.
+
+public class PackedWriter
+{
+   private final ByteArrayOutputStream buffer;
+   private final DataOutputStream out;
+
+   public PackedWriter()
+   {
+      buffer = new ByteArrayOutputStream();
+      out = new DataOutputStream(buffer);
+   }
+
+   // B
+   public PackedWriter writeByte(int value)
+   {
+      try {
+         out.writeByte(value);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   // ?
+   public PackedWriter writeBoolean(boolean value)
+   {
+      try {
+         out.writeBoolean(value);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   // i
+   public PackedWriter writeInt(int value)
+   {
+      try {
+         out.writeInt(value);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   // q
+   public PackedWriter writeLong(long value)
+   {
+      try {
+         out.writeLong(value);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   // d
+   public PackedWriter writeDouble(double value)
+   {
+      try {
+         out.writeDouble(value);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   // H + UTF-8 bytes
+   public PackedWriter writeString(String value)
+   {
+      final byte[] bytes = (value != null ? value : "").getBytes(StandardCharsets.UTF_8);
+      try {
+         out.writeShort(bytes.length);
+         out.write(bytes);
+      } catch (IOException e) {}
+      return this;
+   }
+
+   public int size()
+   {
+      return buffer.size();
+   }
+
+   public byte[] toByteArray()
+   {
+      return buffer.toByteArray();
+   }
+}
@@ -0,0 +1,116 @@
+// SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+// SPDX-License-Identifier: MIT
+
+package dawscript;
+
+import java.io.BufferedReader;
+import java.io.BufferedWriter;
+import java.io.File;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.StandardCopyOption;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.concurrent.ConcurrentHashMap;
+
+// Parameter ranges keyed by device and parameter name, persisted as a tab
+// separated file so probed ranges are available on later sessions.
+
+public class ParameterRangeCache
+{
+   private final File file;
+   private final ConcurrentHashMap<String,double[]> ranges;
+   private boolean dirty; // guarded by this
+
+   public ParameterRangeCache(File file)
+   {
+      this.file = file;
+      ranges = new ConcurrentHashMap<>();
+   }
+
+   public static File getDefaultFile()
+   {
+      return new File(new File(System.getProperty("user.home"), ".dawscript"),
+         "bitwig_parameter_ranges.tsv");
+   }
+
+   public double[] get(String deviceName, String parameterName)
+   {
+      return ranges.get(key(deviceName, parameterName));
+   }
+
+   public boolean contains(String deviceName, String parameterName)
+   {
+      return ranges.containsKey(key(deviceName, parameterName));
+   }
+
+   public synchronized void put(String deviceName, String parameterName, double[] range)
+   {
+      ranges.put(key(deviceName, parameterName), range);
+      dirty = true;
+   }
+
+   public void load() throws IOException
+   {
+      if (! file.exists()) {
+         return;
+      }
+
+      try (final BufferedReader reader = Files.newBufferedReader(file.toPath(), StandardCharsets.UTF_8)) {
+         String line;
+         while ((line = reader.readLine()) != null) {
+            final String[] fields = line.split("\t");
+            if (fields.length != 4) {
+               continue;
+            }
+            try {
+               ranges.put(key(fields[0], fields[1]), new double[] {
+                  Double.parseDouble(fields[2]),
+                  Double.parseDouble(fields[3])
+               });
+            } catch (NumberFormatException e) {
+               // Skip corrupt line
+            }
+         }
+      }
+   }
+
+   public void save() throws IOException
+   {
+      // Snapshot under the lock so a put() during the write marks it dirty again
+      final Map<String,double[]> snapshot;
+
+      synchronized (this) {
+         if (! dirty) {
+            return;
+         }
+         dirty = false;
+         snapshot = new HashMap<>(ranges);
+      }
+
+      file.getParentFile().mkdirs();
+
+      final File temp = new File(file.getPath() + ".tmp");
+
+      try (final BufferedWriter writer = Files.newBufferedWriter(temp.toPath(), StandardCharsets.UTF_8)) {
+         for (final Map.Entry<String,double[]> entry : snapshot.entrySet()) {
+            final double[] range = entry.getValue();
+            writer.write(entry.getKey() + "\t" + range[0] + "\t" + range[1]);
+            writer.newLine();
+         }
+      }
+
+      Files.move(temp.toPath(), file.toPath(), StandardCopyOption.REPLACE_EXISTING);
+   }
+
+   private static String key(String deviceName, String parameterName)
+   {
+      return sanitize(deviceName) + "\t" + sanitize(parameterName);
+   }
+
+   private static String sanitize(String name)
+   {
+      return name == null ? "" : name.replace('\t', ' ').replace('\n', ' ');
+   }
+}
@@ -1,9 +0,0 @@
-// SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
-// SPDX-License-Identifier: MIT
-
-package dawscript;
-
-interface PythonRunnable
-{
-   void run();
-}
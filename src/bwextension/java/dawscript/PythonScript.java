@@ -5,17 +5,23 @@ package dawscript;
 
 import java.io.BufferedReader;
 import java.io.IOException;
+import java.io.InputStream;
 import java.io.InputStreamReader;
 import java.io.File;
 import java.util.Arrays;
 import java.util.ArrayList;
 import java.util.concurrent.TimeUnit;
+import java.util.prefs.Preferences;
 
 public class PythonScript
 {
+   private static final int MAX_BATCH_LINES = 64;
+   private static final long READER_JOIN_MS = 1000;
+   private static final String PYTHON_PATH_KEY = "python_path";
+
    private PrintLineFunction log, error;
    private Process process;
-   private Thread readerThread;
+   private Thread[] readerThreads;
 
    public PythonScript(PrintLineFunction log, PrintLineFunction error) {
       this.log = log;
@@ -35,7 +41,14 @@ public class PythonScript
       final ProcessBuilder processBuilder = new ProcessBuilder(command);
       processBuilder.directory(path.getParentFile());
 
-      process = processBuilder.start();
+      try {
+         process = processBuilder.start();
+      } catch (IOException e) {
+         // Cached interpreter may be gone, resolve again once
+         forgetPythonPath();
+         command.set(0, pythonPath());
+         process = processBuilder.start();
+      }
       process.getOutputStream().close();
 
       // Add shutdown hook to ensure child process is killed if JVM is killed (e.g., macOS Force Quit)
@@ -51,7 +64,7 @@ public class PythonScript
          } catch (Exception ignored) {}
       }));
 
-      startReaderThread();
+      startReaderThreads();
    }
 
    public void stop()
@@ -66,58 +79,108 @@ public class PythonScript
          } catch (InterruptedException e) {
             e.printStackTrace();
          }
+
+         stopReaderThreads();
       }
 
       process = null;
-
-      stopReaderThread();
    }
 
    // macOS: tail -f $HOME/Library/Logs/Bitwig/BitwigStudio.log
-   private void startReaderThread()
+   private void startReaderThreads()
    {
-      readerThread = new Thread(() -> {
-         try (
-            final BufferedReader stdout = new BufferedReader(new InputStreamReader(process.getInputStream()));
-            final BufferedReader stderr = new BufferedReader(new InputStreamReader(process.getErrorStream()));
-         ) {
-            while (process != null || stdout.ready() || stderr.ready()) {
-               while (stdout.ready()) {
-                  final String line = stdout.readLine();
-                  if (line != null) {
-                     log.println(line);
-                  }
-               }
-               while (stderr.ready()) {
-                  final String line = stderr.readLine();
-                  if (line != null) {
-                     error.println(line);
+      readerThreads = new Thread[] {
+         startReaderThread(process.getInputStream(), log, "dawscript-python-stdout"),
+         startReaderThread(process.getErrorStream(), error, "dawscript-python-stderr")
+      };
+   }
+
+   // Blocks on readLine() until the child writes or exits. Lines already
+   // buffered when one arrives are forwarded together in a single call.
+   private static Thread startReaderThread(InputStream stream, PrintLineFunction out, String name)
+   {
+      final Thread thread = new Thread(() -> {
+         try (final BufferedReader reader = new BufferedReader(new InputStreamReader(stream))) {
+            final StringBuilder batch = new StringBuilder();
+            String line;
+
+            while ((line = reader.readLine()) != null) {
+               batch.append(line);
+
+               for (int i = 1; i < MAX_BATCH_LINES && reader.ready(); i++) {
+                  line = reader.readLine();
+                  if (line == null) {
+                     break;
                   }
+                  batch.append('\n').append(line);
                }
-               Thread.sleep(10);
+
+               out.println(batch.toString());
+               batch.setLength(0);
             }
-         } catch (IOException | InterruptedException e) {
+         } catch (IOException e) {
             e.printStackTrace();
          }
-      });
+      }, name);
 
-      readerThread.start();
+      thread.setDaemon(true);
+      thread.start();
+
+      return thread;
    }
 
-   private void stopReaderThread()
+   // A grandchild can inherit the pipes and keep them open after the process
+   // exits, readers still blocked then are unblocked by closing the streams
+   private void stopReaderThreads()
    {
-      if (readerThread != null) {
-         try {
-            readerThread.join();
-         } catch (InterruptedException e) {
-            e.printStackTrace();  
+      if (readerThreads != null) {
+         for (final Thread thread : readerThreads) {
+            try {
+               thread.join(READER_JOIN_MS);
+            } catch (InterruptedException e) {
+               e.printStackTrace();
+            }
+
+            if (thread.isAlive()) {
+               thread.interrupt();
+               process.destroyForcibly();
+
+               try {
+                  process.getInputStream().close();
+                  process.getErrorStream().close();
+               } catch (IOException e) {
+                  e.printStackTrace();
+               }
+            }
          }
       }
 
-      readerThread = null;
+      readerThreads = null;
    }
 
+   // Resolving the interpreter spawns a process, the result is remembered
+   // across sessions and only resolved again when it stops being executable
    private static String pythonPath() throws IOException
+   {
+      final Preferences prefs = Preferences.userNodeForPackage(PythonScript.class);
+      final String cached = prefs.get(PYTHON_PATH_KEY, null);
+
+      if (cached != null && new File(cached).canExecute()) {
+         return cached;
+      }
+
+      final String path = resolvePythonPath();
+      prefs.put(PYTHON_PATH_KEY, path);
+
+      return path;
+   }
+
+   private static void forgetPythonPath()
+   {
+      Preferences.userNodeForPackage(PythonScript.class).remove(PYTHON_PATH_KEY);
+   }
+
+   private static String resolvePythonPath() throws IOException
    {
       final String[][] commands = System.getProperty("os.name").toLowerCase().contains("win")
          ? new String[][] {
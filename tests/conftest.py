@@ -0,0 +1,8 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+
+# The repository root is a package itself, make dawscript_core importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
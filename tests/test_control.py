@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dawscript_core.extra.gadget import ContinuousControl, Target
+
+
+class FakeTarget(Target):
+    def __init__(self, value=0.5):
+        super().__init__()
+        self.value = value
+        self.writes = []
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+        self.writes.append(value)
+
+
+def send(control, value):
+    control.set(value)
+    control.fire_callbacks()
+
+
+def test_hysteresis_drops_jitter():
+    values = []
+    control = ContinuousControl()
+    control.set_callback(values.append)
+
+    for value in (10, 20, 19, 20, 17):
+        send(control, value / 127)
+
+    assert values == [10 / 127, 20 / 127, 17 / 127]
+
+
+def test_deadband():
+    values = []
+    control = ContinuousControl(deadband=2.5 / 127)
+    control.set_callback(values.append)
+
+    for value in (10, 12, 13, 14):
+        send(control, value / 127)
+
+    assert values == [10 / 127, 13 / 127]
+
+
+def test_without_pickup_writes_every_change():
+    target = FakeTarget(0.5)
+    control = ContinuousControl()
+    control.add_target(target)
+
+    send(control, 0.1)
+    send(control, 0.2)
+
+    assert target.writes == [0.1, 0.2]
+
+
+def test_pickup_waits_for_crossing():
+    target = FakeTarget(0.5)
+    control = ContinuousControl(pickup=True)
+    control.add_target(target)
+
+    send(control, 0.1)
+    send(control, 0.3)
+    assert target.writes == []
+
+    send(control, 0.6)
+    send(control, 0.7)
+    assert target.writes == [0.6, 0.7]
+
+
+def test_pickup_within_range():
+    target = FakeTarget(0.5)
+    control = ContinuousControl(pickup=True)
+    control.add_target(target)
+
+    send(control, 0.5 + 1 / 127)
+
+    assert target.writes == [pytest.approx(0.5 + 1 / 127)]
+
+
+def test_pickup_lost_when_host_moves():
+    target = FakeTarget(0.5)
+    control = ContinuousControl(pickup=True)
+    control.add_target(target)
+
+    send(control, 0.5)
+    send(control, 0.6)
+    assert target.writes == [0.5, 0.6]
+
+    target.value = 0.9
+    send(control, 0.7)
+    assert target.writes == [0.5, 0.6]
+
+    send(control, 0.95)
+    assert target.writes == [0.5, 0.6, 0.95]
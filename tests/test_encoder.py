@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dawscript_core.extra.gadget import Encoder, Encoding, Target, decode_relative
+
+
+class FakeTarget(Target):
+    def __init__(self, value=0.5):
+        super().__init__()
+        self.value = value
+        self.writes = []
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+        self.writes.append(value)
+
+
+@pytest.mark.parametrize("encoding, up, down, zero", [
+    (Encoding.TWOS_COMPLEMENT, {1: 1, 63: 63}, {127: -1, 65: -63, 64: -64}, 0),
+    (Encoding.SIGN_MAGNITUDE, {1: 1, 63: 63}, {65: -1, 127: -63}, 0),
+    (Encoding.OFFSET_BINARY, {65: 1, 127: 63}, {63: -1, 0: -64}, 64)
+])
+def test_decode_relative(encoding, up, down, zero):
+    for value, steps in {**up, **down}.items():
+        assert decode_relative(value, encoding) == steps
+    assert decode_relative(zero, encoding) == 0
+
+
+def test_flush_coalesces_writes():
+    target = FakeTarget(0.5)
+    a = Encoder(step=0.1)
+    b = Encoder(step=0.1)
+    a.add_target(target)
+    b.add_target(target)
+
+    a.turn(1, 100.0)
+    a.turn(1, 101.0)
+    b.turn(-3, 102.0)
+    a.fire_callbacks()
+    b.fire_callbacks()
+
+    assert target.writes == [pytest.approx(0.4)]
+
+
+def test_flush_clamps():
+    target = FakeTarget(0.95)
+    encoder = Encoder(step=0.1)
+    encoder.add_target(target)
+
+    encoder.turn(2, 100.0)
+    encoder.fire_callbacks()
+
+    assert target.writes == [1.0]
+
+
+def test_acceleration():
+    deltas = []
+    encoder = Encoder(step=0.1, acceleration=1.0)
+    encoder.set_callback(deltas.append)
+
+    encoder.turn(1, 100.0)
+    encoder.fire_callbacks()
+    encoder.turn(1, 100.001)
+    encoder.fire_callbacks()
+
+    assert deltas == [pytest.approx(0.1), pytest.approx(0.2)]
+
+
+def test_acceleration_reversal():
+    target = FakeTarget(0.2)
+    encoder = Encoder(step=0.01, acceleration=1.0)
+    encoder.add_target(target)
+
+    encoder.turn(1, 100.0)
+    encoder.turn(-1, 100.004)
+    encoder.fire_callbacks()
+
+    assert target.value == pytest.approx(0.2)
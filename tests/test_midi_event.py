@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import copy
+import pickle
+
+import pytest
+from mido import Message
+
+from dawscript_core.host.types import TimestampedMidi
+from dawscript_core.util import MidiEvent, make_cc, make_midi_event, make_midi_events, make_midi_messages
+
+
+def test_channel_fields():
+    event = MidiEvent(bytes([0x93, 60, 100]), 1.5)
+
+    assert event.type == "note_on"
+    assert (event.channel, event.note, event.velocity, event.time) == (3, 60, 100, 1.5)
+    assert not event.is_cc()
+
+
+def test_cc_and_pitch():
+    cc = MidiEvent(bytes([0xB0, 64, 127]))
+    assert cc.is_cc() and cc.is_cc(64) and not cc.is_cc(1)
+    assert (cc.control, cc.value) == (64, 127)
+
+    assert MidiEvent(bytes([0xE0, 0, 64])).pitch == 0
+    assert MidiEvent(bytes([0xE0, 0x7F, 0x7F])).pitch == 8191
+
+
+def test_system_message_falls_back_to_mido():
+    event = MidiEvent(bytes([0xF2, 0x10, 0x01]))
+
+    assert event.channel is None
+    assert event.type == "songpos"
+    assert event.pos == 0x90
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        MidiEvent(bytes([0x90, 60, 100])).bogus
+
+
+def test_to_message_is_shared_and_frozen():
+    a = MidiEvent(bytes([0xB0, 7, 1])).to_message()
+    b = MidiEvent(bytes([0xB0, 7, 1])).to_message()
+
+    assert a is b
+    with pytest.raises(ValueError):
+        a.value = 2
+
+
+def test_equality_with_mido():
+    event = MidiEvent(bytes([0xB0, 64, 127]))
+
+    assert event == make_cc(control=64, value=127)
+    assert event != make_cc(control=64, value=0)
+    assert event == MidiEvent(bytes([0xB0, 64, 127]))
+    assert event != MidiEvent(bytes([0xB0, 64, 127]), 1.0)
+    assert len({event, MidiEvent(bytes([0xB0, 64, 127]))}) == 1
+
+
+def test_copy_and_pickle():
+    event = MidiEvent(bytes([0x90, 60, 100]), 2.0)
+
+    for clone in (copy.copy(event), copy.deepcopy(event), pickle.loads(pickle.dumps(event))):
+        assert clone == event
+        assert clone.note == 60
+
+
+def test_make_functions():
+    midi = [bytes([0x90, 60, 100]), TimestampedMidi(bytes([0x80, 60, 0]), 3.0, None)]
+
+    messages = make_midi_messages(midi)
+    assert all(isinstance(m, Message) for m in messages)
+    assert messages[1].time == 3.0
+
+    events = make_midi_events(midi)
+    assert [e.type for e in events] == ["note_on", "note_off"]
+    assert events[1].time == 3.0
+    assert make_midi_event(midi[1]) == events[1]
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dawscript_core.host.impl.util import compile_midi_filter, midi_filter_accepts
+from dawscript_core.host.types import MidiFilter
+
+
+def accepts(table, *msg):
+    return midi_filter_accepts(table, bytes(msg))
+
+
+def test_accept_all_compiles_to_none():
+    assert compile_midi_filter(None) is None
+    assert compile_midi_filter(MidiFilter()) is None
+
+
+def test_types_and_channels():
+    table = compile_midi_filter(MidiFilter(types=["note_on"], channels=[0, 15]))
+
+    assert accepts(table, 0x90, 60, 100)
+    assert accepts(table, 0x9F, 60, 100)
+    assert not accepts(table, 0x91, 60, 100)
+    assert not accepts(table, 0x80, 60, 0)
+    assert not accepts(table, 0xF8)
+
+
+def test_controls_and_notes():
+    table = compile_midi_filter(MidiFilter(controls=range(64, 68), notes=[0, 127]))
+
+    assert accepts(table, 0xB0, 64, 127)
+    assert accepts(table, 0xB3, 67, 0)
+    assert not accepts(table, 0xB0, 63, 127)
+    assert not accepts(table, 0xB0, 68, 127)
+    assert accepts(table, 0x90, 0, 1)
+    assert accepts(table, 0x80, 127, 0)
+    assert accepts(table, 0xA0, 127, 0)
+    assert not accepts(table, 0x90, 1, 1)
+    # Types without control or note pass
+    assert accepts(table, 0xE0, 0, 64)
+    assert accepts(table, 0xF8)
+
+
+def test_truncated_messages_rejected():
+    table = compile_midi_filter(MidiFilter(controls=[0]))
+
+    assert not accepts(table, 0xB0)
+
+
+def test_system_types_alongside_channel_types():
+    table = compile_midi_filter(MidiFilter(types=["sysex", "clock", "control_change"], channels=[0]))
+
+    assert accepts(table, 0xF0, 0x7E, 0xF7)
+    assert accepts(table, 0xF8)
+    assert accepts(table, 0xB0, 1, 1)
+    assert not accepts(table, 0xB1, 1, 1)
+    assert not accepts(table, 0xFA)
+
+
+def test_unknown_type_raises():
+    with pytest.raises(ValueError):
+        compile_midi_filter(MidiFilter(types=["control_change", "bogus"]))
+
+
+def test_size_overrides_buffer_length():
+    table = compile_midi_filter(MidiFilter(controls=[7]))
+    slot = bytearray(16)
+    slot[0:1] = b"\xb0"
+
+    assert not midi_filter_accepts(table, memoryview(slot), 1)
+    slot[1] = 7
+    assert midi_filter_accepts(table, memoryview(slot), 3)
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dawscript_core.host.impl.util import MidiRing
+
+
+def drain(ring):
+    out = []
+    ring.drain(lambda data, offset: out.append((bytes(data), offset)))
+    return out
+
+
+def test_capacity_must_be_power_of_two():
+    with pytest.raises(ValueError):
+        MidiRing(capacity=6)
+
+
+def test_fifo_order_and_offsets():
+    ring = MidiRing(capacity=8)
+
+    for i in range(5):
+        assert ring.push(bytes([0x90, i, 100]), i * 10)
+
+    assert drain(ring) == [(bytes([0x90, i, 100]), i * 10) for i in range(5)]
+    assert drain(ring) == []
+
+
+def test_wraparound():
+    ring = MidiRing(capacity=4)
+
+    # Many more messages than slots, drained in uneven batches
+    expected, received = [], []
+
+    for i in range(1000):
+        msg = bytes([0xB0, i % 128, i // 128])
+        assert ring.push(msg, i)
+        expected.append((msg, i))
+        if i % 3 == 2:
+            received += drain(ring)
+
+    received += drain(ring)
+
+    assert received == expected
+    assert ring.overflows == 0
+
+
+def test_overflow_when_full():
+    ring = MidiRing(capacity=4)
+
+    assert all(ring.push(bytes([0xF8]), i) for i in range(4))
+    assert not ring.push(bytes([0xFA]), 4)
+    assert ring.overflows == 1
+
+    # Dropped message is not published, the ring is usable after draining
+    assert drain(ring) == [(bytes([0xF8]), i) for i in range(4)]
+    assert ring.push(bytes([0xFC]), 5)
+    assert drain(ring) == [(bytes([0xFC]), 5)]
+
+
+def test_oversized_message_dropped():
+    ring = MidiRing(capacity=4, slot_size=4)
+
+    assert not ring.push(bytes([0xF0, 1, 2, 3, 0xF7]), 0)
+    assert ring.push(bytes([0xF0, 1, 2, 0xF7]), 1)
+    assert ring.overflows == 1
+    assert drain(ring) == [(bytes([0xF0, 1, 2, 0xF7]), 1)]
+
+
+def test_rejected_message_reuses_slot():
+    ring = MidiRing(capacity=4)
+    seen = []
+
+    def accept(slot, size):
+        seen.append((bytes(slot[:size]), len(slot)))
+        return slot[0] != 0xFE
+
+    assert not ring.push(bytes([0xFE]), 0, accept)
+    assert ring.push(bytes([0x90, 1, 2]), 1, accept)
+
+    # accept() sees the whole preallocated slot and the message size
+    assert seen == [(bytes([0xFE]), 16), (bytes([0x90, 1, 2]), 16)]
+    assert drain(ring) == [(bytes([0x90, 1, 2]), 1)]
+    assert ring.overflows == 0
+
+
+def test_drain_returns_count():
+    ring = MidiRing(capacity=4)
+    ring.push(bytes([0xF8]), 0)
+    ring.push(bytes([0xF8]), 1)
+
+    assert ring.drain(lambda data, offset: None) == 2
+    assert ring.drain(lambda data, offset: None) == 0
@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import struct
+
+from dawscript_core.host.impl.util import mask_indices, unpack_project_layout
+
+
+def pack(layout):
+    data = struct.pack(">i", len(layout))
+    for masks in layout:
+        data += struct.pack(">i", len(masks))
+        for mask in masks:
+            data += struct.pack(">i", mask - (1 << 32) if mask & 0x80000000 else mask)  # Java int
+    return data
+
+
+def test_unpack_layout():
+    layout = [[0b101, 0xFFFFFFFF], [], [0x80000001]]
+
+    assert unpack_project_layout(pack(layout)) == layout
+    assert unpack_project_layout(pack([])) == []
+
+
+def test_mask_indices_include_slot_31():
+    assert mask_indices(0) == []
+    assert mask_indices(0b1010) == [1, 3]
+    assert mask_indices(0x80000001) == [0, 31]
+    assert mask_indices(0xFFFFFFFF) == list(range(32))
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+from mido import Message
+
+from dawscript_core.extra.gadget import MidiRouter
+from dawscript_core.host.types import TimestampedMidi
+
+
+def collect(router, *args):
+    events = []
+    router.add(lambda e: events.append(e.data), *args)
+    return events
+
+
+def test_exact_route():
+    router = MidiRouter()
+    events = collect(router, "control_change", 0, 64)
+
+    router.route([bytes([0xB0, 64, 127]), bytes([0xB1, 64, 127]), bytes([0xB0, 65, 127])])
+
+    assert events == [bytes([0xB0, 64, 127])]
+
+
+def test_wildcards():
+    router = MidiRouter()
+    any_channel = collect(router, "control_change", None, 64)
+    any_control = collect(router, "control_change", 2, None)
+    any_cc = collect(router, "control_change")
+
+    router.route([bytes([0xB2, 64, 1]), bytes([0xB5, 64, 2]), bytes([0xB2, 7, 3]), bytes([0x92, 64, 4])])
+
+    assert any_channel == [bytes([0xB2, 64, 1]), bytes([0xB5, 64, 2])]
+    assert any_control == [bytes([0xB2, 64, 1]), bytes([0xB2, 7, 3])]
+    assert any_cc == [bytes([0xB2, 64, 1]), bytes([0xB5, 64, 2]), bytes([0xB2, 7, 3])]
+
+
+def test_notes_match_on_and_off():
+    router = MidiRouter()
+    events = []
+    router.add_message(lambda e: events.append(e.type), Message("note_on", channel=1, note=60))
+
+    router.route([bytes([0x91, 60, 100]), bytes([0x81, 60, 0]), bytes([0x91, 61, 100])])
+
+    assert events == ["note_on", "note_off"]
+
+
+def test_omni_message():
+    router = MidiRouter()
+    events = []
+    router.add_message(lambda e: events.append(e.channel), Message("control_change", control=1), omni=True)
+
+    router.route([bytes([0xB0, 1, 0]), bytes([0xBF, 1, 0])])
+
+    assert events == [0, 15]
+
+
+def test_remove():
+    router = MidiRouter()
+    events = []
+    handler = lambda e: events.append(e)
+    router.add(handler, "control_change", None, 1)
+    router.remove(handler)
+
+    router.route([bytes([0xB0, 1, 0])])
+
+    assert events == []
+
+
+def test_system_messages_not_routed():
+    router = MidiRouter()
+    events = collect(router, "control_change")
+
+    router.route([bytes([0xF8])])
+
+    assert events == []
+
+
+def test_timestamps_reach_events():
+    router = MidiRouter()
+    times = []
+    router.add(lambda e: times.append(e.time), "note_on")
+
+    router.route([TimestampedMidi(bytes([0x90, 60, 100]), 12.5, None)])
+
+    assert times == [12.5]
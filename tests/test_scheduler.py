@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dawscript_core.host.scheduler import Priority, Scheduler
+
+
+def test_priority_order():
+    scheduler = Scheduler()
+    order = []
+
+    scheduler.post(lambda: order.append("low"), Priority.LOW)
+    scheduler.post(lambda: order.append("normal"))
+    scheduler.post(lambda: order.append("high"), Priority.HIGH)
+
+    assert scheduler.run(lambda e: None) is False
+    assert order == ["high", "normal", "low"]
+    assert not scheduler.pending()
+
+
+def test_budget_carries_work_over():
+    scheduler = Scheduler()
+    ran = []
+
+    for i in range(3):
+        scheduler.post(lambda i=i: (ran.append(i), time.sleep(Scheduler.BUDGET_SEC)))
+
+    # At least one item runs per tick, the rest waits
+    assert scheduler.run(lambda e: None) is True
+    assert ran == [0]
+    assert scheduler.run(lambda e: None) is True
+    assert scheduler.run(lambda e: None) is False
+    assert ran == [0, 1, 2]
+
+
+def test_starved_work_runs_first():
+    scheduler = Scheduler()
+    order = []
+
+    scheduler.post(lambda: order.append("low"), Priority.LOW)
+    time.sleep(Scheduler.STARVATION_SEC + 0.01)
+    scheduler.post(lambda: order.append("high"), Priority.HIGH)
+
+    scheduler.run(lambda e: None)
+
+    assert order == ["low", "high"]
+
+
+def test_errors_reported_and_run_continues():
+    scheduler = Scheduler()
+    errors, ran = [], []
+
+    scheduler.post(lambda: 1 / 0)
+    scheduler.post(lambda: ran.append(True))
+
+    scheduler.run(errors.append)
+
+    assert [type(e) for e in errors] == [ZeroDivisionError]
+    assert ran == [True]
+
+
+def test_wakeup():
+    scheduler = Scheduler()
+    calls = []
+
+    scheduler.wakeup()
+    scheduler.set_wakeup(lambda: calls.append(True))
+    scheduler.wakeup()
+
+    assert calls == [True]
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dawscript_core.extra import session
+from dawscript_core.extra.session import Recorder, Replayer, replay_stats
+from dawscript_core.host.types import TimestampedMidi
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session.time, "monotonic", clock)
+    return clock
+
+
+def record(path, clock, message_times=True):
+    recorder = Recorder(str(path), message_times)
+    clock.now += 0.010
+    recorder.record([bytes([0x90, 60, 100]), TimestampedMidi(bytes([0x80, 60, 0]), clock.now - 0.002, 7)])
+    clock.now += 0.020
+    recorder.record([])
+    clock.now += 0.005
+    recorder.record([bytes([0xF0, 1, 2, 3, 0xF7])])
+    recorder.close()
+
+
+def test_round_trip(tmp_path, clock):
+    path = tmp_path / "session.dsmr"
+    record(path, clock)
+
+    ticks = list(Replayer(str(path)).ticks())
+
+    assert [t for t, _ in ticks] == pytest.approx([0.0, 0.020, 0.025], abs=1e-5)
+    assert [midi for _, midi in ticks] == [
+        [bytes([0x90, 60, 100]), bytes([0x80, 60, 0])],
+        [],
+        [bytes([0xF0, 1, 2, 3, 0xF7])]
+    ]
+
+
+def test_round_trip_message_times(tmp_path, clock):
+    path = tmp_path / "session.dsmr"
+    record(path, clock)
+
+    ticks = list(Replayer(str(path)).ticks(timestamps=True))
+    first = ticks[0][1]
+
+    assert [m.data for m in first] == [bytes([0x90, 60, 100]), bytes([0x80, 60, 0])]
+    assert [m.time for m in first] == pytest.approx([0.0, -0.002], abs=1e-5)
+    assert ticks[2][1][0].time == pytest.approx(0.025, abs=1e-5)
+
+
+def test_without_message_times(tmp_path, clock):
+    path = tmp_path / "session.dsmr"
+    record(path, clock, message_times=False)
+
+    first = list(Replayer(str(path)).ticks(timestamps=True))[0][1]
+
+    assert [m.time for m in first] == [0.0, 0.0]
+
+
+def test_bad_header(tmp_path):
+    path = tmp_path / "bad.dsmr"
+
+    path.write_bytes(b"DS")
+    with pytest.raises(ValueError):
+        Replayer(str(path))
+
+    path.write_bytes(b"MIDI\x01\x00")
+    with pytest.raises(ValueError):
+        Replayer(str(path))
+
+    path.write_bytes(b"DSMR\x09\x00")
+    with pytest.raises(ValueError):
+        Replayer(str(path))
+
+
+def test_truncated_body(tmp_path, clock):
+    path = tmp_path / "session.dsmr"
+    record(path, clock)
+    path.write_bytes(path.read_bytes()[:-3])
+
+    with pytest.raises(ValueError):
+        list(Replayer(str(path)).ticks())
+
+
+def test_replay_stats():
+    assert replay_stats([], 5).ticks == 0
+
+    stats = replay_stats([float(n) for n in range(1, 101)], 42)
+
+    assert (stats.ticks, stats.messages, stats.max_us) == (100, 42, 100.0)
+    assert stats.mean_us == pytest.approx(50.5)
+    assert stats.p50_us == 51.0
+    assert stats.p99_us == 100.0
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2025 Luciano Iam <oss@lucianoiam.com>
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dawscript_core.extra.gadget import Footswitch, GadgetHub, TimerWheel
+
+RES = 0.01
+
+
+def test_expires_at_deadline_not_before():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 8)
+    wheel.schedule("a", t0 + 0.035)
+
+    assert wheel.advance(t0 + 0.02) == []
+    assert wheel.advance(t0 + 0.034) == []
+    assert wheel.advance(t0 + 0.035) == ["a"]
+    assert len(wheel) == 0
+    assert wheel.advance(t0 + 0.05) == []
+
+
+def test_later_deadline_in_current_slot():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 8)
+    wheel.advance(t0)
+    wheel.schedule("a", t0 + RES / 2)
+
+    # Same slot as the cursor, must survive being visited early
+    assert wheel.advance(t0) == []
+    assert wheel.advance(t0 + RES / 2) == ["a"]
+
+
+def test_past_deadline_expires_on_next_advance():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 8)
+    wheel.advance(t0)
+    wheel.schedule("a", t0 - 1)
+
+    assert wheel.advance(t0) == ["a"]
+
+
+def test_deadline_beyond_one_revolution():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 4)
+    wheel.schedule("a", t0 + 0.1)
+
+    for k in range(1, 10):
+        assert wheel.advance(t0 + k * RES) == []
+
+    assert wheel.advance(t0 + 0.1) == ["a"]
+
+
+def test_long_gap_between_advances():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 4)
+
+    for i in range(10):
+        wheel.schedule(i, t0 + i * 0.013)
+
+    assert sorted(wheel.advance(t0 + 10)) == list(range(10))
+    assert len(wheel) == 0
+
+
+def test_reschedule_and_cancel():
+    t0 = time.monotonic()
+    wheel = TimerWheel(RES, 8)
+    wheel.schedule("a", t0 + 0.01)
+    wheel.schedule("a", t0 + 0.05)
+    wheel.schedule("b", t0 + 0.02)
+    wheel.cancel("b")
+    wheel.cancel("missing")
+
+    assert len(wheel) == 1
+    assert wheel.advance(t0 + 0.03) == []
+    assert wheel.advance(t0 + 0.05) == ["a"]
+
+
+def test_hub_schedules_footswitch_gestures():
+    footswitch = Footswitch()
+    footswitch.map_midi_press(type="control_change", control=64, value=127)
+    footswitch.map_midi_release(type="control_change", control=64, value=0)
+    states = []
+    footswitch.set_callback_pressed(lambda: states.append("pressed"))
+    footswitch.set_callback_released(lambda: states.append("released"))
+
+    hub = GadgetHub([footswitch])
+
+    hub.process([])
+    assert len(hub._wheel) == 0
+
+    hub.process([bytes([0xB0, 64, 127])])
+    assert states == ["pressed"]
+    assert len(hub._wheel) == 0
+
+    hub.process([bytes([0xB0, 64, 0])])
+    assert states == ["pressed"]
+    assert len(hub._wheel) == 1  # RELEASED is decided after PRESS_TWICE_SEC
+
+    time.sleep(Footswitch.PRESS_TWICE_SEC + 0.05)
+    hub.process([])
+    assert states == ["pressed", "released"]
+    assert len(hub._wheel) == 0